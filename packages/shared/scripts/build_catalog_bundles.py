@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Build one minified, content-hashed unit catalog bundle per faction.
+
+Each faction's unit JSON files are combined into
+packages/frontend/public/catalog/<faction>.<hash>.json, and manifest.json maps
+faction ids to their current bundle, so the frontend only fetches the faction
+it needs. The hash is taken from the bundle's bytes, so an unchanged faction
+keeps its file name (and its cache entry) from one build to the next.
+
+If data/rules-references.json exists (scripts/build_rules_references.py), each
+unit gets 'ruleReferences' (keyword -> reference id) and each bundle a 'rules'
+table of the references its units use, so definitions are a direct lookup.
+
+Units marked '_needs_manual_review' by scripts/extract_units_from_text.py are
+left out of the bundles and listed in the build output.
+
+Usage:
+    python build_catalog_bundles.py
+    python build_catalog_bundles.py --output-dir path/to/catalog
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from update_unit_points import SHARED_DIR, UNITS_DIR, write_json_atomic, write_text_atomic
+
+CATALOG_DIR = SHARED_DIR.parent / "frontend" / "public" / "catalog"
+RULES_REFERENCES_PATH = SHARED_DIR / "data" / "rules-references.json"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+HASH_LENGTH = 12
+BUNDLE_PATTERN = re.compile(rf'^(?P<faction>[a-z0-9-]+)\.(?P<hash>[0-9a-f]{{{HASH_LENGTH}}})\.json$')
+
+def load_faction_units(faction_dir):
+    """Load a faction's unit files keyed by unit id.
+
+    Units marked '_needs_manual_review' by the extractor are left out until
+    someone has checked them. Other keys starting with '_' (_provenance) are
+    extraction bookkeeping, not catalog data, and are dropped.
+
+    Returns:
+        (units, flagged) - flagged lists the ids of the units left out
+    """
+    units, flagged = {}, []
+    for json_file in sorted(faction_dir.glob("*.json")):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            unit_data = json.load(f)
+        unit_id = unit_data.get('id', json_file.stem)
+        if unit_data.get('_needs_manual_review'):
+            flagged.append(unit_id)
+            continue
+        units[unit_id] = {k: v for k, v in unit_data.items() if not k.startswith('_')}
+    return units, flagged
+
+def load_rules_references(path=RULES_REFERENCES_PATH):
+    """Load the precomputed keyword -> rules section references, if built."""
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def attach_rule_references(faction_id, units, rules_references):
+    """Add each unit's ruleReferences and return the faction's rules table."""
+    rules = {}
+    for unit_id, unit_data in units.items():
+        links = rules_references['units'].get(f"{faction_id}/{unit_id}")
+        if not links:
+            continue
+        unit_data['ruleReferences'] = links
+        for reference_id in links.values():
+            rules[reference_id] = rules_references['references'][reference_id]
+    return dict(sorted(rules.items()))
+
+def build_bundle(faction_id, units, rules=None):
+    """Serialize a faction bundle.
+
+    Returns:
+        (minified JSON text, content hash)
+    """
+    bundle = {'factionId': faction_id, 'units': units}
+    if rules:
+        bundle['rules'] = rules
+    text = json.dumps(bundle, ensure_ascii=False, separators=(',', ':'))
+    return text, hashlib.sha256(text.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+
+def build_catalog(output_dir=CATALOG_DIR):
+    """Write every faction's bundle and the manifest, removing stale bundles.
+
+    Returns:
+        The manifest dict
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {'version': MANIFEST_VERSION, 'factions': {}}
+    rules_references = load_rules_references()
+    if rules_references is None:
+        print(f"  Note: {RULES_REFERENCES_PATH.name} not found; bundles will have no rule references")
+
+    for faction_dir in sorted(p for p in UNITS_DIR.iterdir() if p.is_dir()):
+        units, flagged = load_faction_units(faction_dir)
+        faction_id = faction_dir.name
+        if flagged:
+            print(f"  ! {faction_id}: left out {len(flagged)} units marked for review: {', '.join(flagged)}")
+        if not units:
+            continue
+        rules = attach_rule_references(faction_id, units, rules_references) if rules_references else None
+        text, digest = build_bundle(faction_id, units, rules)
+        filename = f"{faction_id}.{digest}.json"
+        bundle_path = output_dir / filename
+
+        # Same name means same bytes, so an existing bundle is already current
+        if bundle_path.exists():
+            status = 'unchanged'
+        else:
+            write_text_atomic(bundle_path, text)
+            status = 'written'
+
+        manifest['factions'][faction_id] = {
+            'file': filename,
+            'hash': digest,
+            'units': len(units),
+            'bytes': len(text.encode('utf-8')),
+        }
+        print(f"  ✓ {faction_id}: {len(units)} units, {len(text) / 1024:.1f} KB ({status})")
+
+    # Drop bundles the manifest no longer points at
+    current = {entry['file'] for entry in manifest['factions'].values()}
+    for path in output_dir.glob("*.json"):
+        if BUNDLE_PATTERN.match(path.name) and path.name not in current:
+            path.unlink()
+            print(f"  - removed stale {path.name}")
+
+    manifest_path = output_dir / MANIFEST_NAME
+    existing = None
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+    if existing != manifest:
+        write_json_atomic(manifest_path, manifest)
+
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build per-faction content-hashed unit catalog bundles and a manifest.")
+    parser.add_argument('--output-dir', type=Path, default=CATALOG_DIR,
+                        help=f"Directory for the bundles and manifest (default: {CATALOG_DIR})")
+    args = parser.parse_args()
+
+    print(f"Building catalog bundles in {args.output_dir}...")
+    manifest = build_catalog(args.output_dir)
+    total = sum(entry['bytes'] for entry in manifest['factions'].values())
+    print(f"\n✓ {len(manifest['factions'])} faction bundles, {total / 1024:.1f} KB total")
+
+if __name__ == "__main__":
+    main()
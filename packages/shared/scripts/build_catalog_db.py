@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Compile the unit JSON files and the parsed Battle Profile tables into one
+SQLite catalog with indexes, for queries that would otherwise scan every file.
+Units marked '_needs_manual_review' by the extractor are left out.
+
+Usage:
+    python build_catalog_db.py
+    python build_catalog_db.py --output /tmp/catalog.db
+
+Example queries:
+    -- All Monsters under 200 pts
+    SELECT u.name, u.points FROM units u
+    JOIN unit_keywords k ON k.unit_pk = u.pk
+    WHERE k.kind = 'unit' AND k.keyword = 'Monster' AND u.points < 200;
+
+    -- Units with Ward (5+)
+    SELECT u.faction_id, u.name FROM units u
+    JOIN unit_keywords k ON k.unit_pk = u.pk WHERE k.keyword = 'Ward (5+)';
+
+    -- Reactions, whatever they react to or however often they can be used
+    SELECT u.name, a.name, a.timing FROM abilities a JOIN units u ON u.pk = a.unit_pk
+    WHERE a.phase = 'Reaction';
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from update_unit_points import (
+    BATTLE_PROFILES_DIR,
+    FACTIONS_JSON_PATH,
+    SHARED_DIR,
+    UNITS_DIR,
+    build_profile_index,
+    profile_columns,
+    read_publication,
+    usable_rows,
+)
+
+CATALOG_DB_PATH = SHARED_DIR / "data" / "catalog.db"
+SCHEMA_VERSION = 1
+
+# "Once Per Turn (Army), Reaction: You declared..." -> frequency + phase
+FREQUENCY_PATTERN = re.compile(r'^(Once Per (?:Battle|Turn)(?: \(Army\))?),\s*')
+
+SCHEMA = """
+CREATE TABLE factions (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    grand_alliance TEXT
+);
+
+CREATE TABLE units (
+    pk INTEGER PRIMARY KEY,
+    faction_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    subtitle TEXT,
+    move TEXT,
+    health INTEGER,
+    save TEXT,
+    control INTEGER,
+    banishment TEXT,
+    unit_size,
+    points INTEGER,
+    regiment_options TEXT,
+    notes TEXT,
+    base_size TEXT,
+    is_manifestation INTEGER NOT NULL DEFAULT 0,
+    is_faction_terrain INTEGER NOT NULL DEFAULT 0,
+    source_file TEXT,
+    UNIQUE (faction_id, id)
+);
+CREATE INDEX units_faction ON units (faction_id);
+CREATE INDEX units_points ON units (points);
+CREATE INDEX units_name ON units (name);
+
+-- kind: 'unit' or 'faction' (warscroll keywords) or 'profile' (battle profile)
+CREATE TABLE unit_keywords (
+    unit_pk INTEGER NOT NULL REFERENCES units (pk),
+    kind TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (unit_pk, kind, keyword)
+) WITHOUT ROWID;
+CREATE INDEX unit_keywords_keyword ON unit_keywords (keyword, kind);
+
+-- kind: 'melee' or 'ranged'
+CREATE TABLE weapons (
+    unit_pk INTEGER NOT NULL REFERENCES units (pk),
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    range TEXT,
+    attacks,
+    hit TEXT,
+    wound TEXT,
+    rend,
+    damage,
+    ability TEXT,
+    PRIMARY KEY (unit_pk, kind, position)
+);
+CREATE INDEX weapons_ability ON weapons (ability);
+
+CREATE TABLE abilities (
+    pk INTEGER PRIMARY KEY,
+    unit_pk INTEGER NOT NULL REFERENCES units (pk),
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    timing TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    frequency TEXT,
+    declare TEXT,
+    effect TEXT NOT NULL,
+    description TEXT,
+    restrictions TEXT
+);
+CREATE INDEX abilities_unit ON abilities (unit_pk);
+CREATE INDEX abilities_phase ON abilities (phase);
+
+CREATE TABLE ability_keywords (
+    ability_pk INTEGER NOT NULL REFERENCES abilities (pk),
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (ability_pk, keyword)
+) WITHOUT ROWID;
+CREATE INDEX ability_keywords_keyword ON ability_keywords (keyword);
+
+-- Every row of every Battle Profile file, matched to units or not
+CREATE TABLE profile_rows (
+    source_file TEXT NOT NULL,
+    publication TEXT,
+    section TEXT NOT NULL,
+    name TEXT NOT NULL,
+    unit_size,
+    points INTEGER NOT NULL,
+    points_change INTEGER,
+    updated INTEGER NOT NULL DEFAULT 0,
+    regiment_options TEXT,
+    keywords TEXT,
+    notes TEXT,
+    base_size TEXT,
+    PRIMARY KEY (source_file, section, name)
+);
+CREATE INDEX profile_rows_section ON profile_rows (section);
+CREATE INDEX profile_rows_points ON profile_rows (points);
+
+CREATE TABLE battle_formations (
+    faction_id TEXT NOT NULL REFERENCES factions (id),
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    PRIMARY KEY (faction_id, id)
+);
+"""
+
+def split_timing(timing):
+    """Split a free-form ability timing into (phase, frequency).
+
+    'Once Per Turn (Army), Any Combat Phase' -> ('Any Combat Phase', 'Once Per Turn (Army)')
+    'Reaction: You declared a Fight ability'  -> ('Reaction', None)
+    """
+    frequency = None
+    match = FREQUENCY_PATTERN.match(timing)
+    if match:
+        frequency, timing = match.group(1), timing[match.end():]
+    phase = 'Reaction' if timing.startswith('Reaction') else timing
+    return phase, frequency
+
+def insert_unit(db, unit_data):
+    """Insert one unit and its keywords, weapons and abilities.
+
+    Returns:
+        False (and nothing is inserted) if the faction already has a unit
+        with this id
+    """
+    if db.execute("SELECT 1 FROM units WHERE faction_id = ? AND id = ?",
+                  (unit_data['factionId'], unit_data['id'])).fetchone():
+        return False
+
+    characteristics = unit_data.get('characteristics', {})
+    profile = unit_data.get('battleProfile', {})
+    cursor = db.execute(
+        """INSERT INTO units (faction_id, id, name, subtitle, move, health, save, control,
+                              banishment, unit_size, points, regiment_options, notes, base_size,
+                              is_manifestation, is_faction_terrain, source_file)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (
+            unit_data['factionId'], unit_data['id'], unit_data['name'], unit_data.get('subtitle'),
+            characteristics.get('move'), characteristics.get('health'), characteristics.get('save'),
+            characteristics.get('control'), characteristics.get('banishment'),
+            profile.get('unitSize'), profile.get('points'),
+            # Some curated heroes keep regiment options and notes at the top level
+            profile.get('regimentOptions', unit_data.get('regimentOptions')),
+            profile.get('notes', unit_data.get('notes')),
+            profile.get('baseSize'),
+            int(bool(profile.get('isManifestation'))), int(bool(profile.get('isFactionTerrain'))),
+            unit_data.get('sourceFile'),
+        ),
+    )
+    unit_pk = cursor.lastrowid
+
+    keywords = unit_data.get('keywords', {})
+    db.executemany(
+        "INSERT OR IGNORE INTO unit_keywords (unit_pk, kind, keyword) VALUES (?, ?, ?)",
+        [(unit_pk, kind, keyword)
+         for kind, values in (('unit', keywords.get('unit', [])),
+                              ('faction', keywords.get('faction', [])),
+                              ('profile', profile.get('keywords', [])))
+         for keyword in values],
+    )
+
+    for kind in ('melee', 'ranged'):
+        db.executemany(
+            """INSERT INTO weapons (unit_pk, kind, position, name, range, attacks, hit, wound,
+                                    rend, damage, ability)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [(unit_pk, kind, position, weapon['name'], weapon.get('range'), weapon.get('attacks'),
+              weapon.get('hit'), weapon.get('wound'), weapon.get('rend'), weapon.get('damage'),
+              weapon.get('ability'))
+             for position, weapon in enumerate(unit_data.get(f'{kind}Weapons') or [])],
+        )
+
+    for position, ability in enumerate(unit_data.get('abilities', [])):
+        phase, frequency = split_timing(ability['timing'])
+        cursor = db.execute(
+            """INSERT INTO abilities (unit_pk, position, name, timing, phase, frequency, declare,
+                                      effect, description, restrictions)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (unit_pk, position, ability['name'], ability['timing'], phase, frequency,
+             ability.get('declare'), ability['effect'], ability.get('description'),
+             ability.get('restrictions')),
+        )
+        db.executemany(
+            "INSERT OR IGNORE INTO ability_keywords (ability_pk, keyword) VALUES (?, ?)",
+            [(cursor.lastrowid, keyword) for keyword in ability.get('keywords', [])],
+        )
+    return True
+
+def insert_profile_rows(db, battle_profile_path):
+    """Insert every row of one Battle Profile file.
+
+    Rows with a garbled name are left out, and rows whose text columns failed
+    the sanity checks get NULL text columns.
+
+    Returns:
+        Number of rows inserted
+    """
+    publication = read_publication(battle_profile_path)
+    rows = []
+    for title, (units, _) in build_profile_index(battle_profile_path).items():
+        for name, profile in usable_rows(units).items():
+            columns = profile_columns(profile)
+            rows.append((battle_profile_path.name, publication, title, name, profile['unitSize'],
+                         profile['points'], profile.get('pointsChange'), int(profile.get('updated', False)),
+                         columns.get('regimentOptions'), ', '.join(columns.get('keywords', [])) or None,
+                         columns.get('notes'), columns.get('baseSize')))
+    db.executemany(
+        """INSERT OR IGNORE INTO profile_rows (source_file, publication, section, name, unit_size,
+                                               points, points_change, updated, regiment_options,
+                                               keywords, notes, base_size)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        rows,
+    )
+    return len(rows)
+
+def build_catalog_db(output_path=CATALOG_DB_PATH):
+    """Build the catalog into a temp file and rename it over output_path.
+
+    Returns:
+        Dict of table name -> row count
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=output_path.parent, prefix=output_path.name, suffix='.tmp')
+    os.close(fd)
+    try:
+        db = sqlite3.connect(temp_path)
+        try:
+            db.executescript(SCHEMA)
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+            with open(FACTIONS_JSON_PATH, 'r', encoding='utf-8') as f:
+                factions_data = json.load(f)
+            for faction_id, faction in factions_data.items():
+                db.execute("INSERT INTO factions (id, name, grand_alliance) VALUES (?, ?, ?)",
+                           (faction_id, faction['name'], faction.get('grandAlliance')))
+                db.executemany(
+                    "INSERT OR IGNORE INTO battle_formations (faction_id, id, name, description) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(faction_id, formation['id'], formation['name'], formation.get('description'))
+                     for formation in faction.get('battleFormations') or []],
+                )
+
+            for json_file in sorted(UNITS_DIR.glob("*/*.json")):
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    unit_data = json.load(f)
+                if unit_data.get('_needs_manual_review'):
+                    print(f"  ! Skipped {json_file.relative_to(UNITS_DIR)}: marked for review")
+                    continue
+                if not insert_unit(db, unit_data):
+                    print(f"  ✗ Skipped {json_file.relative_to(UNITS_DIR)}: "
+                          f"duplicate unit id '{unit_data['id']}' in {unit_data['factionId']}")
+
+            for battle_profile_path in sorted(BATTLE_PROFILES_DIR.glob("Battle Profile*.txt")):
+                count = insert_profile_rows(db, battle_profile_path)
+                print(f"  ✓ {battle_profile_path.name}: {count} profile rows")
+
+            db.commit()
+            counts = {
+                table: db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for (table,) in db.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")
+            }
+            db.execute("ANALYZE")
+            db.commit()
+        finally:
+            db.close()
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile unit JSON files and Battle Profile tables into a SQLite catalog.")
+    parser.add_argument('--output', type=Path, default=CATALOG_DB_PATH,
+                        help=f"SQLite file to write (default: {CATALOG_DB_PATH})")
+    args = parser.parse_args()
+
+    print(f"Building {args.output}...")
+    counts = build_catalog_db(args.output)
+    print("\n✓ " + ", ".join(f"{count} {table}" for table, count in counts.items()))
+
+if __name__ == "__main__":
+    main()
@@ -1,134 +1,474 @@
 #!/usr/bin/env python3
 """
-Extract unit points and battle formations from Battle Profile txt files and update JSON files.
+Extract battle profiles (unit size, points, regiment options or keywords, notes
+and base size) and battle formations from Battle Profile txt files and update
+JSON files.
+
+Usage:
+    python update_unit_points.py [--faction SLUG ...]
+    python update_unit_points.py --pipeline [--workers N] [--writers N]
+    python update_unit_points.py --changes [PUBLICATION]
+    python update_unit_points.py --dry-run [--report json]
+    python update_unit_points.py --check-fixtures
+
+--pipeline parses every faction section on a process pool and hands unit file
+writes to a small pool of writer threads behind one bounded queue.
+
+Every run also records each parsed file's points, ✹ markers and (+N) deltas
+under its publication date (e.g. "2025-09") in data/points-history.json;
+--changes lists what changed in a publication from that store without
+re-parsing anything. The store is committed with the unit files: once a
+Battle Profile text file is replaced by a newer publication, the history is
+the only record of the old one's points.
+
+--dry-run computes the full change set without writing anything; with
+--report json it is printed to stdout as JSON (progress goes to stderr) and the
+exit status is 1 if any unit file matched no profile row. Manifestations and
+faction terrain (battleProfile.isManifestation / isFactionTerrain) have no
+profile row, and Warhammer Legends units are listed in a separate Legends
+section of the Battle Profiles; unit files listed in legends-units.json are
+reported as 'excluded' instead of 'unmatched'. `npm run check:points` runs the
+dry run against the current data.
+
+Rows whose columns were garbled by the text extraction are caught by
+check_profile_row: they only update unit size and points, and the unit file
+keeps its other battleProfile values. --check-fixtures parses the table
+snippets in fixtures/battle-profile-rows.json and compares the rows with the
+expected ones.
 """
 
+import argparse
+import contextlib
+import hashlib
 import json
+import queue
 import re
 import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Base paths
 SCRIPT_DIR = Path(__file__).parent
 SHARED_DIR = SCRIPT_DIR.parent
 UNITS_DIR = SHARED_DIR / "data" / "units"
-FACTIONS_JSON_PATH = SHARED_DIR / "src" / "data" / "factions.json"
+FACTIONS_JSON_PATH = SHARED_DIR / "data" / "factions" / "factions.json"
+POINTS_HISTORY_PATH = SHARED_DIR / "data" / "points-history.json"
+ROW_FIXTURES_PATH = SCRIPT_DIR / "fixtures" / "battle-profile-rows.json"
+LEGENDS_UNITS_PATH = SCRIPT_DIR / "legends-units.json"
 BATTLE_PROFILES_DIR = SHARED_DIR.parent.parent / "docs" / "references" / "factions"
 
-def extract_unit_points_from_file(filepath):
-    """Extract unit points from a faction-specific Battle Profile txt file."""
-    units = {}
+# Map faction slugs to their Battle Profile txt files
+# Format: (faction_slug, battle_profile_filename, faction_name_in_file)
+# faction_name_in_file is only needed for factions in the main Battle Profiles.txt
+FACTIONS = [
+    ('flesh-eater-courts', 'Battle Profile - Flesh Eater Courts.txt', None),
+    ('ossiarch-bonereapers', 'Battle Profiles.txt', 'OSSIARCH BONEREAPERS'),
+    ('slaves-to-darkness', 'Battle Profiles.txt', 'SLAVES TO DARKNESS'),
+    ('stormcast-eternals', 'Battle Profiles.txt', 'STORMCAST ETERNALS'),
+]
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+# Unit files waiting for a writer thread before update_faction_data blocks
+WRITE_QUEUE_SIZE = 64
 
-    # Pattern to match unit lines in the UNITS or HEROES sections
-    # Examples:
-    # ✹ Crypt Flayers 3 150 (+10) Knights, Infantry 50mm
-    # Crypt Ghouls 20 160 Serfs, Infantry 25mm
-    # ✹ Abhorrant Archregent 1 160 (-20) 0-1 Royal Attendant, 40mm
+# Hand-written unit files print arrays of strings and numbers on one line,
+# '"unit": ["Hero", "Infantry"]'; json.dumps(indent=2) puts each item on its own
+INLINE_ARRAY_PATTERN = re.compile(r'": \[(?=["\d\-tfn])')
+EXPANDED_SCALAR_ARRAY_PATTERN = re.compile(
+    r'\[\n\s*((?:"(?:[^"\\\n]|\\.)*"|[-\w.]+)(?:,\n\s*(?:"(?:[^"\\\n]|\\.)*"|[-\w.]+))*)\n\s*\]'
+)
 
-    unit_pattern = re.compile(
-        r'^[✹\s]*([A-Za-z][A-Za-z\s\-\'\(\),]+?)\s+(\d+)\s+(\d+)\s+(?:\([+-]\d+\)\s+)?',
-        re.MULTILINE
-    )
+# Battle profile tables. Each row has a single "anchor" line carrying the unit
+# size and points; text in the other columns wraps onto lines above and below:
+#
+#   ✹ Abhorrant Ghoul King on 0-1 Royal Attendant,
+#   1 350 (+30) 130mm
+#   Royal Terrorgheist Any Flesh-eater Courts
+TABLE_HEADER_PATTERN = re.compile(r'^(HEROES|UNITS|TYPE)\s+(?:UNIT SIZE|NAME)\b')
+BADGE_PATTERN = re.compile(r'^(?:(?:NEW|UPDATED)(?:\s+|$))+')
+ROW_PATTERN = re.compile(
+    r'^(?P<pre>.*?)(?:^|\s)(?P<size>\d+) (?P<points>\d+)(?: \((?P<change>[+-]\d+)\))?(?=\s|$)(?P<post>.*)$'
+)
+BASE_SIZE_PATTERN = re.compile(
+    r'(?:^|\s)(?P<base>(?:\[\d+\],?\s*)?(?:\d+(?:\.\d+)?(?: × \d+(?:\.\d+)?)?mm(?: \[\d+\])?,?\s*)+)$'
+)
+# Where the regiment options column starts in a wrapped HEROES line
+OPTIONS_START_PATTERN = re.compile(r'(?:^|(?<=\s))(?:0-\d+\s|Any\s|None\b)')
+NOTES_START_PATTERN = re.compile(
+    r'(?:^|(?<=\s))(?:This (?:Hero|unit|Regiment)\b|You can\b|You cannot\b|Champion is\b|'
+    r'Cannot\b|Must\b|Only\b|Counts as\b|Play for\b|General\'s Handbook\b)'
+)
+NAME_CONNECTOR_PATTERN = re.compile(r'(?:\b(?:on|of|the|with|and|in|a)|,)$')
+# The end of a wrapped name followed by the end of a notes sentence:
+# "Relic Envoy regiment as a Freeguild Veteran."
+NAME_THEN_NOTES_PATTERN = re.compile(
+    r"^(?P<name>[A-Z][\w'-]*,?(?: (?:on|of|the|with|and|in|a|[A-Z][\w'-]*,?))*) (?P<notes>[a-z].*\.)$"
+)
+OPTION_WORDS = {'or', 'and', 'of', 'the', 'to'}
+ROLE_PATTERN = re.compile(r"0-1 ([A-Z][\w'-]*(?: [A-Z][\w'-]*)*)")
 
-    for match in unit_pattern.finditer(content):
-        unit_name = match.group(1).strip()
-        points = int(match.group(3))
+# Pattern to match battle formation lines:
+# ✹ Battle Formation Knightly Echelon 0 Battletome: Flesh-eater Courts
+# Battle Formation Lords of the Manor 0 Battletome: Flesh-eater Courts
+# ✹ Battle Formation Veteran Cannoneers 30 (+30) Scourge of Ghyran
+FORMATION_PATTERN = re.compile(
+    r'^[✹\s]*Battle Formation\s+([A-Za-z][A-Za-z\s\-\']+?)\s+\d+\s+(?:\([+-]\d+\)\s+)?(.+)$',
+    re.MULTILINE
+)
 
-        # Clean up unit name (remove trailing numbers from multi-model units)
-        # e.g., "Crypt Flayers (2 models)" -> "Crypt Flayers"
-        unit_name = re.sub(r'\s*\(\d+ models?\)', '', unit_name)
+# Every page starts with the same header, followed by the section title:
+# --- Page 39 --- / ® / BATTLE PROFILES / SEPTEMBER 2025 / OSSIARCH BONEREAPERS
+PAGE_MARKER_PATTERN = re.compile(r'^---\s*Page\s+\d+\s*---$')
+PAGE_HEADER_PATTERN = re.compile(r'^(?:®|BATTLE PROFILES|[A-Z]+ \d{4})$')
+MONTHS = ['JANUARY', 'FEBRUARY', 'MARCH', 'APRIL', 'MAY', 'JUNE', 'JULY',
+          'AUGUST', 'SEPTEMBER', 'OCTOBER', 'NOVEMBER', 'DECEMBER']
+PUBLICATION_DATE_PATTERN = re.compile(rf'^({"|".join(MONTHS)}) (\d{{4}})$')
 
-        units[unit_name] = points
+# Parsed row fields that describe the publication rather than the unit; they
+# go to the points history, not to battleProfile
+HISTORY_FIELDS = ('updated', 'pointsChange')
 
-    return units
+# Sanity checks on a parsed row. Column text that wrapped onto the wrong row
+# shows up as a name ending in a base size or a sentence, notes that stop
+# mid-sentence, options that run into each other, or unknown keywords.
+BAD_NAME_PATTERN = re.compile(r'\d(?:mm|\s*×)|\(required\)|\.$')
+# Stray text that can be cut off a name: a required regiment option wrapped in
+# front of it ("Neave's Companions (required), Neave Blacktalon") or the tail
+# of a notes sentence wrapped after it ("... Hurricane Crossbows 60 × 35mm.")
+STRAY_NAME_TEXT_PATTERN = re.compile(
+    r"^(?P<option>[^,()]+ \(required\),\s*)|(?P<notes>\s+\d+(?:\.\d+)?(?: × \d+(?:\.\d+)?)?mm\.)$"
+)
+REGIMENT_OPTION_PATTERN = re.compile(
+    r"^(?:(?:0-\d+|Any) (?:(?!(?:0-\d+|Any)\s)[^.(,])+|(?!Any |0-)[^.(,]+ \(required\)|None)$"
+)
+TEXT_COLUMNS = ('regimentOptions', 'keywords', 'notes', 'baseSize')
 
-def extract_battle_formations(filepath, faction_name=None):
-    """Extract battle formations from a Battle Profile txt file.
+# Drop caps are extracted as a separate letter: "A uric Flamekeeper"
+DROP_CAP_PATTERN = re.compile(r'^([A-Z]) (?=[a-z])')
 
-    Args:
-        filepath: Path to the txt file
-        faction_name: If provided, extract only formations for this faction (e.g., "OSSIARCH BONEREAPERS")
-                     If None, extract all formations (for faction-specific files)
+def split_sections(filepath):
+    """Split a Battle Profile txt file into sections in a single pass.
+
+    Each page repeats its section title (e.g. "OSSIARCH BONEREAPERS") right
+    after the page header, so consecutive pages with the same title are joined
+    into one section.
+
+    Returns:
+        Dict of section title -> section text, in file order
     """
-    formations = []
+    sections = {}
+    title, expecting_title = None, False
 
     with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    if faction_name:
-        # Extract formations only for the specified faction
-        # The structure is: FACTION_NAME -> UPDATED -> HEROES/UNITS -> TYPE NAME POINTS NOTES -> Battle Formations -> next page
-        # We need to find from the faction name to the next faction or end of content
-
-        # Split content into lines for easier processing
-        lines = content.split('\n')
-
-        # Find the start of the faction section
-        faction_start = -1
-        for i, line in enumerate(lines):
-            if line.strip() == faction_name:
-                faction_start = i
-                break
-
-        if faction_start == -1:
-            print(f"  Warning: Could not find section for {faction_name}")
-            return formations
-
-        # Find the end of the faction section (next major faction section, not page breaks)
-        # Faction sections can span multiple pages, so we need to continue through page breaks
-        # Page headers repeat the faction name, so we need to skip those
-        faction_end = len(lines)
-        for i in range(faction_start + 1, len(lines)):
-            line = lines[i].strip()
-
-            # Look for next faction (short all-caps line that's not a common keyword)
-            # Must be 3+ words and not contain "POINTS", "SIZE", "NOTES" etc.
-            if (re.match(r'^[A-Z][A-Z\s\-]+$', line) and
-                len(line) <= 30 and  # Faction names are typically short
-                line not in ['UPDATED', 'NEW', 'BATTLE PROFILES', 'SEPTEMBER 2025', 'WARHAMMER LEGENDS'] and
-                not re.search(r'(POINTS|SIZE|NOTES|HEROES|UNITS|LEGENDS|REGIMENT|OPTIONS|BASE)', line)):
-
-                # Check if this is a page header (preceded by "BATTLE PROFILES" or "SEPTEMBER 2025")
-                prev_lines = [lines[i-j].strip() for j in range(1, min(6, i+1))]
-                is_page_header = ('BATTLE PROFILES' in prev_lines or
-                                'SEPTEMBER 2025' in prev_lines or
-                                any(re.match(r'^---\s*Page\s+\d+', l) for l in prev_lines))
-
-                if is_page_header and line == faction_name:
-                    # Skip this, it's just a page header repeating the SAME faction name
+        for line in f:
+            stripped = line.strip()
+            if PAGE_MARKER_PATTERN.match(stripped):
+                expecting_title = True
+                continue
+            if expecting_title:
+                if not stripped or PAGE_HEADER_PATTERN.match(stripped):
                     continue
-                elif is_page_header and line != faction_name:
-                    # This is a DIFFERENT faction in a page header - stop here!
-                    faction_end = i
-                    break
+                title, expecting_title = stripped, False
+                sections.setdefault(title, [])
+                continue
+            if title is not None:
+                sections[title].append(line)
 
-                # Double check it's not a page header continuation
-                # If the next few lines don't look like content, it's probably a new faction
-                next_line = lines[i+1].strip() if i+1 < len(lines) else ""
-                if next_line in ['UPDATED', 'NEW', ''] or re.match(r'^HEROES\s+UNIT', next_line):
-                    faction_end = i
-                    break
+    return {title: ''.join(lines) for title, lines in sections.items()}
 
-        # Extract the faction section
-        faction_content = '\n'.join(lines[faction_start:faction_end])
-    else:
-        # Use entire file content (for faction-specific files)
-        faction_content = content
+def clean_profile_line(line):
+    """Normalize a table line: straight quotes, plain hyphens, and a NEW/UPDATED
+    badge in front of a row turned into the '✹' row marker."""
+    line = line.strip().replace('’', "'").replace('\u2011', '-')
+    text = BADGE_PATTERN.sub('', line).strip()
+    if text != line and text:
+        return f"✹ {text}"
+    return text
+
+def is_open(fragments, endings):
+    """Whether the last fragment of a column continues onto the next line."""
+    return bool(fragments) and fragments[-1].endswith(endings)
+
+def split_trailing_notes(text, roles=()):
+    """Split notes continuation text off the end of a column.
 
-    # Pattern to match battle formation lines:
-    # ✹ Battle Formation Knightly Echelon 0 Battletome: Flesh-eater Courts
-    # Battle Formation Lords of the Manor 0 Battletome: Flesh-eater Courts
-    # ✹ Battle Formation Veteran Cannoneers 30 (+30) Scourge of Ghyran
+    'Any Serfs regiment as a' -> ('Any Serfs', 'regiment as a'). Options never
+    end in a full stop, so 'Any Warrior Chamber Stormcast Exemplar.' is split
+    before the role that finishes "...can join an eligible regiment as a".
+    """
+    words = text.split()
+    depth = 0
+    for n, word in enumerate(words):
+        depth += word.count('(') - word.count(')')
+        if depth == 0 and word[0].islower() and word not in OPTION_WORDS:
+            return ' '.join(words[:n]), ' '.join(words[n:])
+
+    if text.endswith('.'):
+        for role in sorted(roles, key=len, reverse=True):
+            if text[:-1].endswith(f' {role}'):
+                return text[:-len(role) - 1].strip(), text[-len(role) - 1:]
+    return text, ''
+
+def find_middle_start(text, kind, keyword_pattern):
+    """Find where the regiment options (HEROES) or keywords (UNITS) column starts."""
+    pattern = OPTIONS_START_PATTERN if kind == 'HEROES' else keyword_pattern
+    return pattern.search(text) if pattern else None
 
-    formation_pattern = re.compile(
-        r'^[✹\s]*Battle Formation\s+([A-Za-z][A-Za-z\s\-\']+?)\s+\d+\s+(?:\([+-]\d+\)\s+)?(.+)$',
-        re.MULTILINE
+def add_fragment(row, text, kind, vocabulary, anchor=False):
+    """Split one line's text into the row's name, middle, notes and base columns.
+
+    Columns are in table order, so base sizes are peeled off the end, notes
+    start at a known sentence opener, and the name is whatever precedes the
+    middle column. Text with no marker continues whichever column is still open.
+    """
+    base = BASE_SIZE_PATTERN.search(text)
+    if base:
+        row['base'].append(base.group('base').strip())
+        text = text[:base.start()].strip()
+
+    notes = ''
+    notes_start = NOTES_START_PATTERN.search(text)
+    if notes_start:
+        text, notes = text[:notes_start.start()].strip(), text[notes_start.start():]
+
+    if text:
+        middle_start = None if anchor else find_middle_start(text, kind, vocabulary['keywords'])
+        if anchor or (middle_start and middle_start.start() == 0):
+            middle = text
+        elif middle_start:
+            row['name'].append(text[:middle_start.start()].strip())
+            middle = text[middle_start.start():]
+        elif text[0].islower() and is_open(row['notes'], tuple('abcdefghijklmnopqrstuvwxyz,')):
+            middle, notes = '', f"{text} {notes}".strip()
+        elif row['name'] and NAME_CONNECTOR_PATTERN.search(row['name'][-1]) and \
+                is_open(row['notes'], tuple('abcdefghijklmnopqrstuvwxyz,')) and \
+                NAME_THEN_NOTES_PATTERN.match(text):
+            name_then_notes = NAME_THEN_NOTES_PATTERN.match(text)
+            row['name'].append(name_then_notes.group('name'))
+            middle, notes = '', f"{name_then_notes.group('notes')} {notes}".strip()
+        elif not row['name'] or NAME_CONNECTOR_PATTERN.search(row['name'][-1]):
+            row['name'].append(text)
+            middle = ''
+        elif is_open(row['middle'], (',', ' or')):
+            middle = text
+        elif row['notes'] and not row['notes'][-1].endswith('.'):
+            middle, notes = '', f"{text} {notes}".strip()
+        else:
+            row['name'].append(text)
+            middle = ''
+
+        if middle:
+            middle, trailing = split_trailing_notes(middle, vocabulary['roles'])
+            if middle:
+                row['middle'].append(middle)
+            notes = f"{trailing} {notes}".strip()
+
+    if notes:
+        row['notes'].append(notes)
+
+def continues_row(row, line):
+    """Whether a line between two anchors still belongs to the row above it."""
+    return (
+        line[0].islower()
+        or line.endswith('.')  # a finished sentence never wraps down onto the next row
+        or is_open(row['middle'], (',', ' or'))
+        or (row['notes'] and not row['notes'][-1].endswith('.'))
+        or is_open(row['base'], (',',))
+        or bool(row['name'] and NAME_CONNECTOR_PATTERN.search(row['name'][-1]))
+        or row['below'] < row['above']
     )
 
-    for match in formation_pattern.finditer(faction_content):
+def iter_table_lines(content):
+    """Yield (kind, line) for each HEROES/UNITS table line, kind None elsewhere."""
+    kind = None
+    for raw_line in content.split('\n'):
+        header = TABLE_HEADER_PATTERN.match(raw_line.strip())
+        if header:
+            kind = header.group(1) if header.group(1) != 'TYPE' else None
+            yield kind, None  # a header starts a new table
+            continue
+        line = clean_profile_line(raw_line)
+        if line and not line.isdigit():  # page numbers
+            yield kind, line
+
+def build_keyword_pattern(content):
+    """Collect the UNITS keyword phrases from unambiguous anchor lines."""
+    phrases = set()
+    for kind, line in iter_table_lines(content):
+        row = ROW_PATTERN.match(line) if kind == 'UNITS' and line else None
+        if not row:
+            continue
+        post = BASE_SIZE_PATTERN.sub('', row.group('post')).strip()
+        notes_start = NOTES_START_PATTERN.search(post)
+        if notes_start:
+            post = post[:notes_start.start()]
+        phrases.update(k.strip() for k in post.split(',') if k.strip())
+    if not phrases:
+        return None
+    alternatives = '|'.join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))
+    return re.compile(rf'(?:^|(?<=\s))(?:{alternatives})(?:,|$)')
+
+def extract_profile_rows(content):
+    """Extract full HEROES/UNITS battle profile rows from one faction's text.
+
+    Lines between two anchor lines are given to the upper row while they still
+    continue one of its columns (or balance its wrapped lines), and to the
+    lower row from the first line that starts a new one (e.g. a '✹' line).
+
+    Returns:
+        Dict of unit name -> battleProfile dict with unitSize, points,
+        regimentOptions (heroes) or keywords (units), notes and baseSize,
+        plus the HISTORY_FIELDS 'updated' (row marked ✹) and 'pointsChange'
+        (the printed (+N) delta) when present, and 'rejected' when the row
+        failed check_profile_row
+    """
+    vocabulary = {
+        'keywords': build_keyword_pattern(content),
+        'roles': set(ROLE_PATTERN.findall(content.replace('\u2011', '-'))),
+    }
+    rows, table, pending, kind = [], [], [], None
+
+    def flush():
+        # Lines after the last anchor of a table belong to its last row
+        if table:
+            for line in pending:
+                add_fragment(table[-1], line, kind, vocabulary)
+                table[-1]['below'] += 1
+        rows.extend(table)
+
+    for line_kind, line in iter_table_lines(content):
+        if line is None or line_kind != kind:
+            flush()
+            table, pending, kind = [], [], line_kind
+            if line is None:
+                continue
+        if kind is None:
+            continue
+
+        anchor = ROW_PATTERN.match(line)
+        if not anchor:
+            pending.append(line)
+            continue
+
+        row = {'kind': kind, 'name': [], 'middle': [], 'notes': [], 'base': [], 'above': 0, 'below': 0,
+               'unitSize': int(anchor.group('size')), 'points': int(anchor.group('points')),
+               'updated': anchor.group('pre').startswith('✹'), 'change': anchor.group('change')}
+
+        # Split the lines since the previous anchor between it and this row
+        split = 0
+        if table:
+            previous = table[-1]
+            for line_before in pending:
+                if line_before.startswith('✹') or not continues_row(previous, line_before):
+                    break
+                add_fragment(previous, line_before, kind, vocabulary)
+                previous['below'] += 1
+                split += 1
+            if split == len(pending) and split and not anchor.group('pre').strip('✹ '):
+                # This row's name must have been wrapped above its anchor
+                split -= 1
+                previous['below'] -= 1
+        for line_above in pending[split:]:
+            row['updated'] = row['updated'] or line_above.startswith('✹')
+            add_fragment(row, line_above.lstrip('✹ '), kind, vocabulary)
+            row['above'] += 1
+
+        pre = anchor.group('pre').strip('✹ ')
+        if pre:
+            row['name'].append(pre)
+        add_fragment(row, anchor.group('post').strip(), kind, vocabulary, anchor=True)
+        table.append(row)
+        pending = []
+
+    flush()
+
+    profiles = {}
+    for row in rows:
+        name = DROP_CAP_PATTERN.sub(r'\1', ' '.join(row['name']).strip(' ,'))
+        profile = {'unitSize': row['unitSize'], 'points': row['points']}
+        middle = ' '.join(row['middle']).strip(' ,')
+        if middle and row['kind'] == 'HEROES':
+            profile['regimentOptions'] = middle
+        elif middle:
+            profile['keywords'] = [k.strip() for k in middle.split(',') if k.strip()]
+        if row['notes']:
+            profile['notes'] = ' '.join(row['notes'])
+        if row['base']:
+            profile['baseSize'] = ' '.join(row['base'])
+        if row['updated']:
+            profile['updated'] = True
+        if row['change']:
+            profile['pointsChange'] = int(row['change'])
+        stray = [m.group().strip(' ,') for m in STRAY_NAME_TEXT_PATTERN.finditer(name)]
+        name = STRAY_NAME_TEXT_PATTERN.sub('', name)
+        rejected = check_profile_row(name, profile, vocabulary)
+        if stray:
+            rejected['wrappedText'] = f"{' '.join(stray)!r} wrapped into the name"
+        if rejected:
+            profile['rejected'] = rejected
+        profiles.setdefault(name, profile)
+
+    return profiles
+
+def check_profile_row(name, profile, vocabulary):
+    """Sanity check a parsed row's name and text columns.
+
+    The text extraction sometimes puts wrapped column text on the wrong row.
+    Unit size and points come from the row's own anchor line and stay
+    trustworthy; the other columns don't once any of them looks wrong.
+
+    Returns:
+        Dict of column -> why it was rejected (empty if the row looks sound);
+        a rejected 'name' means the row can't be matched to a unit at all
+    """
+    rejected = {}
+    if not name or BAD_NAME_PATTERN.search(name):
+        rejected['name'] = "name has text from another column"
+
+    notes = profile.get('notes')
+    if notes is not None and not (NOTES_START_PATTERN.match(notes) and notes.endswith('.')):
+        rejected['notes'] = "notes are not whole sentences"
+
+    options = profile.get('regimentOptions')
+    if options is not None:
+        items = options.split(', ')
+        if len(set(items)) < len(items) or \
+                not all(REGIMENT_OPTION_PATTERN.match(item) for item in items):
+            rejected['regimentOptions'] = "regiment options run together"
+
+    keyword_pattern = vocabulary['keywords']
+    unknown = [k for k in profile.get('keywords', [])
+               if '.' in k or keyword_pattern is None or not keyword_pattern.fullmatch(k)]
+    if unknown:
+        rejected['keywords'] = f"unknown keywords {', '.join(unknown)}"
+
+    if 'baseSize' not in profile:
+        rejected['baseSize'] = "no base size"
+    return rejected
+
+def usable_rows(units):
+    """Drop the rows whose name failed check_profile_row."""
+    return {name: profile for name, profile in units.items()
+            if 'name' not in profile.get('rejected', {})}
+
+def profile_columns(profile):
+    """The battleProfile columns of a parsed row.
+
+    History fields are left out, and so are the text columns of a row that
+    failed check_profile_row, so the unit file keeps its existing values.
+    """
+    return {k: v for k, v in profile.items()
+            if k not in HISTORY_FIELDS and k != 'rejected'
+            and not ('rejected' in profile and k in TEXT_COLUMNS)}
+
+def extract_battle_formations(content):
+    """Extract battle formations from the text of one faction's battle profiles."""
+    formations = []
+
+    for match in FORMATION_PATTERN.finditer(content):
         formation_name = match.group(1).strip()
         source = match.group(2).strip()
 
@@ -142,117 +482,720 @@ def extract_battle_formations(filepath, faction_name=None):
 
     return formations
 
+def build_profile_index(filepath):
+    """Scan a Battle Profile txt file once and index every faction section.
+
+    Returns:
+        Dict of section title (e.g. "OSSIARCH BONEREAPERS") -> (units, formations),
+        where units maps unit name -> battleProfile dict
+    """
+    return {
+        title: (extract_profile_rows(content), extract_battle_formations(content))
+        for title, content in split_sections(filepath).items()
+    }
+
+def parse_section(title, content):
+    """Parse one section's profile rows and formations (process pool worker)."""
+    return title, (extract_profile_rows(content), extract_battle_formations(content))
+
+def build_profile_indexes(paths, workers):
+    """Build the section index of several Battle Profile files on a process pool.
+
+    Every section is parsed as its own task, so the large shared Battle
+    Profiles.txt is spread across workers rather than parsed by one.
+
+    Returns:
+        Dict of path -> section index, as build_profile_index
+    """
+    sections = {path: split_sections(path) for path in paths}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            path: [pool.submit(parse_section, title, content) for title, content in file_sections.items()]
+            for path, file_sections in sections.items()
+        }
+        return {path: dict(future.result() for future in path_futures)
+                for path, path_futures in futures.items()}
+
+def normalize_name(name):
+    """Normalize a unit name for matching: "✹ B attlemage" -> "battlemage"."""
+    name = DROP_CAP_PATTERN.sub(r'\1', name.strip(' ✹'))
+    name = name.lower().replace("'", '').replace('’', '')
+    return ' '.join(re.findall(r'[a-z0-9]+', name))
+
+def build_name_index(faction_points):
+    """Index a faction's battle profile names once for fast matching.
+
+    Returns:
+        (exact, words) where exact maps normalized name -> profile name and
+        words maps each normalized word -> set of profile names containing it
+    """
+    exact, words = {}, {}
+    for profile_name in faction_points:
+        key = normalize_name(profile_name)
+        exact.setdefault(key, profile_name)
+        for word in key.split():
+            words.setdefault(word, set()).add(profile_name)
+    return exact, words
+
+def match_unit_name(unit_name, name_index):
+    """Find the battle profile name for a unit.
+
+    An exact normalized match wins. Otherwise candidates sharing a word with the
+    unit are kept if their name contains the unit's as a whole-word phrase, and
+    the shortest such name wins. So "Nagash" still finds "Nagash, Supreme Lord
+    of the Undead", but "Chaos Lord" never takes "Chaos Lord on Karkadrak"'s
+    points. A profile whose name is only part of the unit's is no match either
+    way: "Chaos Sorcerer Lord on Manticore" is not "Chaos Sorcerer Lord", and
+    such profiles come back under partial for the caller to report.
+
+    Returns:
+        (profile_name, tied, partial) - profile_name is None when nothing
+        matches or the best candidates tie, in which case tied lists them;
+        when nothing matches, partial lists the profiles whose names are only
+        part of the unit's
+    """
+    exact, words = name_index
+    key = normalize_name(unit_name)
+    if not key:
+        return None, [], []
+    if key in exact:
+        return exact[key], [], []
+
+    unit_words = key.split()
+    candidates = set()
+    for word in unit_words:
+        candidates |= words.get(word, set())
+
+    scored, partial = {}, []
+    for profile_name in candidates:
+        profile_key = normalize_name(profile_name)
+        if f' {key} ' in f' {profile_key} ':
+            scored[profile_name] = -len(profile_key.split())
+        elif f' {profile_key} ' in f' {key} ':
+            partial.append(profile_name)
+
+    if not scored:
+        return None, [], sorted(partial)
+    best = max(scored.values())
+    tied = sorted(name for name, score in scored.items() if score == best)
+    if len(tied) > 1:
+        return None, tied, []
+    return tied[0], [], []
+
+def match_unit(unit_data, name_index):
+    """Find the battle profile name for a unit file, as match_unit_name.
+
+    Mounts and titles live in the subtitle ("Chaos Lord" + "on Karkadrak"), so
+    the subtitled name is tried first. Only a title falls back to the bare
+    name; a mount's bare name is the unit on foot, with different points.
+    """
+    unit_name = unit_data.get('name', '')
+    subtitle = unit_data.get('subtitle')
+    if not subtitle:
+        return match_unit_name(unit_name, name_index)
+
+    profile_name, tied, partial = match_unit_name(f"{unit_name} {subtitle}", name_index)
+    if profile_name is not None or subtitle.lower().startswith(('on ', 'with ')):
+        return profile_name, tied, partial
+    fallback, fallback_tied, fallback_partial = match_unit_name(unit_name, name_index)
+    if fallback is None and not fallback_tied:
+        return None, tied, partial or fallback_partial
+    return fallback, fallback_tied, fallback_partial
+
 def slugify(text):
     """Convert text to slug format."""
     return text.lower().replace(' ', '-').replace("'", '')
 
-def update_faction_data(faction_slug, battle_profile_filename, faction_name_in_file=None):
-    """Update unit points and battle formations for a faction.
+def load_profile_index(battle_profile_path, profile_indexes):
+    """Return the section index for a Battle Profile file, scanning it only once.
+
+    Args:
+        battle_profile_path: Path to the txt file
+        profile_indexes: Dict of path -> index shared across factions, so that
+                         factions sharing Battle Profiles.txt reuse one scan
+    """
+    if battle_profile_path not in profile_indexes:
+        profile_indexes[battle_profile_path] = build_profile_index(battle_profile_path)
+    return profile_indexes[battle_profile_path]
+
+def merge_battle_profile(old_profile, columns):
+    """Upsert profile columns into a unit's battleProfile.
+
+    The given columns replace their old values and come first; keys they don't
+    mention (e.g. isManifestation) are kept after them.
+    """
+    battle_profile = dict(columns)
+    for key, value in old_profile.items():
+        battle_profile.setdefault(key, value)
+    return battle_profile
+
+def write_unit_json(json_file, unit_data):
+    """Write a unit JSON file in the repo's formatting.
+
+    A file that prints its keyword arrays on one line keeps doing so, so
+    rewriting a hand-written file only changes the values that changed.
+    """
+    json_file = Path(json_file)
+    text = json.dumps(unit_data, indent=2, ensure_ascii=False)
+    if json_file.exists() and INLINE_ARRAY_PATTERN.search(json_file.read_text(encoding='utf-8')):
+        text = EXPANDED_SCALAR_ARRAY_PATTERN.sub(
+            lambda match: '[' + re.sub(r',\n\s*', ', ', match.group(1)) + ']', text)
+    with open(json_file, 'w', encoding='utf-8') as f:
+        f.write(text + '\n')
+
+class UnitWriter:
+    """Write unit JSON files on background threads fed by one bounded queue.
+
+    write() blocks while the queue is full, so parsing never runs far ahead
+    of the disk. close() waits for the queue to drain and re-raises the first
+    write error.
+    """
+
+    def __init__(self, threads=4, queue_size=WRITE_QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.written = 0
+        self.errors = []
+        self.lock = threading.Lock()
+        self.threads = [threading.Thread(target=self._run, daemon=True) for _ in range(threads)]
+        for thread in self.threads:
+            thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            json_file, unit_data = item
+            try:
+                write_unit_json(json_file, unit_data)
+                with self.lock:
+                    self.written += 1
+            except Exception as e:
+                with self.lock:
+                    self.errors.append((json_file, e))
+
+    def write(self, json_file, unit_data):
+        self.queue.put((json_file, unit_data))
+
+    def close(self):
+        """Flush pending writes and stop the threads.
+
+        Returns:
+            Number of unit files written
+        """
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.errors:
+            json_file, error = self.errors[0]
+            raise OSError(f"Failed to write {json_file}: {error}") from error
+        return self.written
+
+def update_faction_data(faction_slug, battle_profile_filename, faction_name_in_file=None,
+                        profile_indexes=None, writer=None, dry_run=False, legends=()):
+    """Update unit points for a faction and collect its battle formations.
 
     Args:
         faction_slug: Slug used in directory/file names (e.g., 'ossiarch-bonereapers')
         battle_profile_filename: Name of the txt file to read
         faction_name_in_file: Name of faction as it appears in Battle Profiles.txt (e.g., 'OSSIARCH BONEREAPERS')
                              Only needed for factions in the main Battle Profiles.txt file
+        profile_indexes: Optional cache of already-scanned Battle Profile files
+        writer: Optional UnitWriter; unit files are written inline without one
+        dry_run: Work out the changes without writing any unit files
+        legends: File stems of the faction's Warhammer Legends units
+
+    Returns:
+        Dict with the faction's battleFormations (for write_battle_formations),
+        counts of updated, unchanged, ambiguous, unmatched and excluded unit
+        files (see excluded_reason), a
+        per-unit report under 'units', the profile rows that failed
+        check_profile_row's name check under 'rejectedRows', and 'error' if
+        the faction was skipped
     """
+    result = {'battleFormations': [], 'updated': 0, 'unchanged': 0, 'ambiguous': 0,
+              'unmatched': 0, 'excluded': 0, 'units': [], 'rejectedRows': [], 'error': None}
 
     print(f"\nProcessing {faction_slug}...")
 
     # Find the battle profile file
     battle_profile_path = BATTLE_PROFILES_DIR / battle_profile_filename
     if not battle_profile_path.exists():
-        print(f"Warning: Battle profile not found at {battle_profile_path}")
-        return
+        result['error'] = f"Battle profile not found at {battle_profile_path}"
+        print(f"Warning: {result['error']}")
+        return result
 
-    # Extract unit points
-    faction_points = extract_unit_points_from_file(battle_profile_path)
-    print(f"  Found {len(faction_points)} units with points")
+    index = load_profile_index(battle_profile_path, {} if profile_indexes is None else profile_indexes)
 
-    # Extract battle formations
-    battle_formations = extract_battle_formations(battle_profile_path, faction_name_in_file)
+    # Extract unit points and battle formations from the faction's own section
+    # (faction-specific files only have the one section)
+    if faction_name_in_file:
+        if faction_name_in_file not in index:
+            result['error'] = f"Could not find section for {faction_name_in_file}"
+            print(f"  Warning: {result['error']}")
+            return result
+        sections = [index[faction_name_in_file]]
+    else:
+        sections = list(index.values())
+
+    faction_points = {}
+    battle_formations = result['battleFormations']
+    for units, formations in sections:
+        faction_points.update(usable_rows(units))
+        battle_formations.extend(formations)
+        for name, profile in units.items():
+            if name not in faction_points:
+                print(f"  ! Rejected row {name!r}: {profile['rejected']['name']}")
+                result['rejectedRows'].append({'name': name, 'reasons': list(profile['rejected'].values())})
+    print(f"  Found {len(faction_points)} units with points")
     print(f"  Found {len(battle_formations)} battle formations")
 
     # Update unit JSON files
     faction_dir = UNITS_DIR / faction_slug
     if faction_dir.exists():
-        updated_count = 0
+        name_index = build_name_index(faction_points)
         for json_file in faction_dir.glob("*.json"):
             with open(json_file, 'r', encoding='utf-8') as f:
                 unit_data = json.load(f)
 
             unit_name = unit_data.get('name', '')
 
-            # Try to find matching points
-            points = None
-            for profile_name, profile_points in faction_points.items():
-                # Exact match (case-insensitive)
-                if unit_name.lower() == profile_name.lower():
-                    points = profile_points
-                    break
-                # Partial match
-                if profile_name.lower() in unit_name.lower() or unit_name.lower() in profile_name.lower():
-                    points = profile_points
-                    break
-
-            if points is not None:
-                # Update battleProfile
-                if 'battleProfile' not in unit_data:
-                    unit_data['battleProfile'] = {
-                        'unitSize': 1,
-                        'points': 0,
-                        'baseSize': '40mm'
-                    }
+            # Try to find the matching profile row
+            profile = None
+            profile_name, tied, partial = match_unit(unit_data, name_index)
+            excluded = excluded_reason(unit_data, json_file, legends)
+            report = {'name': unit_name, 'file': json_file.name}
+            result['units'].append(report)
+            if profile_name is not None:
+                profile = faction_points[profile_name]
+                report['profile'] = profile_name
+            elif tied:
+                print(f"    ? {unit_name}: ambiguous, candidates {', '.join(tied)}")
+                result['ambiguous'] += 1
+                report.update(status='ambiguous', candidates=tied)
+            elif excluded is not None:
+                result['excluded'] += 1
+                report.update(status='excluded', reason=excluded)
+            else:
+                result['unmatched'] += 1
+                report['status'] = 'unmatched'
+                if partial:
+                    # A row for part of the name is a different unit, not a match
+                    print(f"    ? {unit_name}: unmatched, only part of {', '.join(partial)}")
+                    report['candidates'] = partial
 
-                old_points = unit_data['battleProfile'].get('points', 0)
-                unit_data['battleProfile']['points'] = points
+            if profile is not None:
+                if 'rejected' in profile:
+                    reasons = list(profile['rejected'].values())
+                    print(f"    ! {unit_name}: kept existing text columns ({'; '.join(reasons)})")
+                    report['rejected'] = reasons
+                old_profile = unit_data.get('battleProfile', {})
+                columns = profile_columns(profile)
+                battle_profile = merge_battle_profile(old_profile, columns)
+                if battle_profile == old_profile:
+                    result['unchanged'] += 1
+                    report['status'] = 'unchanged'
+                    continue
+                unit_data['battleProfile'] = battle_profile
 
                 # Write back
-                with open(json_file, 'w', encoding='utf-8') as f:
-                    json.dump(unit_data, f, indent=2, ensure_ascii=False)
-                    f.write('\n')
+                if dry_run:
+                    pass
+                elif writer is not None:
+                    writer.write(json_file, unit_data)
+                else:
+                    write_unit_json(json_file, unit_data)
 
-                if old_points != points:
-                    print(f"    {unit_name}: {old_points} -> {points} pts")
-                updated_count += 1
+                old_points = old_profile.get('points')
+                if old_points != profile['points']:
+                    print(f"    {unit_name}: {old_points or 0} -> {profile['points']} pts")
+                changed = sorted(k for k in columns if k != 'points' and old_profile.get(k) != columns[k])
+                if changed:
+                    print(f"    {unit_name}: updated {', '.join(changed)}")
+                result['updated'] += 1
+                report.update(status='updated', pointsBefore=old_points, pointsAfter=profile['points'],
+                              changedFields=changed)
 
-        print(f"  Updated {updated_count} unit files")
+        verb = 'Would update' if dry_run else 'Updated'
+        print(f"  {verb} {result['updated']} unit files ({result['unchanged']} unchanged)")
+        if result['ambiguous']:
+            print(f"  Skipped {result['ambiguous']} units with ambiguous matches")
+        if result['unmatched']:
+            print(f"  {result['unmatched']} units matched no profile row")
+        if result['excluded']:
+            print(f"  {result['excluded']} manifestation, faction terrain or Legends units have no profile row")
     else:
-        print(f"  Warning: Unit directory not found: {faction_dir}")
+        result['error'] = f"Unit directory not found: {faction_dir}"
+        print(f"  Warning: {result['error']}")
 
-    # Update faction JSON with battle formations
-    if battle_formations:
-        with open(FACTIONS_JSON_PATH, 'r', encoding='utf-8') as f:
-            factions_data = json.load(f)
+    return result
 
-        if faction_slug in factions_data:
-            factions_data[faction_slug]['battleFormations'] = battle_formations
+def write_json_atomic(path, data):
+    """Write JSON to a temp file next to path and rename it into place."""
+    write_text_atomic(path, json.dumps(data, indent=2, ensure_ascii=False) + '\n')
 
-            with open(FACTIONS_JSON_PATH, 'w', encoding='utf-8') as f:
-                json.dump(factions_data, f, indent=2, ensure_ascii=False)
-                f.write('\n')
+def write_text_atomic(path, text):
+    """Write text to a temp file next to path and rename it into place."""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        # mkstemp creates the file 0600; keep the mode of the file it replaces
+        os.chmod(temp_path, path.stat().st_mode & 0o777 if path.exists() else 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
 
-            print(f"  Added {len(battle_formations)} battle formations to factions.json")
-        else:
+def file_sha256(path):
+    """Return the hex SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def merge_battle_formations(old_formations, battle_formations):
+    """Merge a faction's parsed battle formations into its existing ones by id.
+
+    Existing formations are kept as they are (with their hand-written name and
+    description) and in their order; formations the Battle Profile no longer
+    lists are removed, and new ones are added at the end with the placeholder
+    "From <source>" description.
+    """
+    parsed = {formation['id']: formation for formation in battle_formations}
+    merged = [formation for formation in old_formations if formation['id'] in parsed]
+    kept = {formation['id'] for formation in merged}
+    return merged + [formation for formation_id, formation in parsed.items() if formation_id not in kept]
+
+def write_battle_formations(formation_updates, dry_run=False):
+    """Apply every faction's battle formations to factions.json in one write.
+
+    Formations are merged by id (see merge_battle_formations), so factions.json
+    is only rewritten when a formation was added or removed.
+
+    Args:
+        formation_updates: Dict of faction slug -> list of battle formations
+        dry_run: Work out the changes without writing factions.json
+
+    Returns:
+        List of {'faction', 'before', 'after'} formation id lists for each
+        faction whose formations changed (empty if nothing changed)
+    """
+    with open(FACTIONS_JSON_PATH, 'r', encoding='utf-8') as f:
+        factions_data = json.load(f)
+
+    changed = []
+    for faction_slug, battle_formations in formation_updates.items():
+        if faction_slug not in factions_data:
             print(f"  Warning: Faction '{faction_slug}' not found in factions.json")
+            continue
+        old_formations = factions_data[faction_slug].get('battleFormations') or []
+        merged = merge_battle_formations(old_formations, battle_formations)
+        if merged != old_formations:
+            factions_data[faction_slug]['battleFormations'] = merged
+            changed.append({
+                'faction': faction_slug,
+                'before': [formation['id'] for formation in old_formations],
+                'after': [formation['id'] for formation in merged],
+            })
+
+    if not changed:
+        print("\nfactions.json battle formations are up to date")
+        return changed
+
+    slugs = ', '.join(change['faction'] for change in changed)
+    if dry_run:
+        print(f"\nWould update battle formations in factions.json for: {slugs}")
+        return changed
+    write_json_atomic(FACTIONS_JSON_PATH, factions_data)
+    print(f"\nUpdated battle formations in factions.json for: {slugs}")
+    return changed
+
+def read_publication(filepath):
+    """Return a Battle Profile file's publication date, e.g. "2025-09".
+
+    The date is stamped under the BATTLE PROFILES header ("SEPTEMBER 2025").
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = PUBLICATION_DATE_PATTERN.match(line.strip())
+            if match:
+                return f"{match.group(2)}-{MONTHS.index(match.group(1)) + 1:02d}"
+    return None
+
+def excluded_reason(unit_data, json_file, legends):
+    """Say why a unit file is not expected to have a profile row, or return None."""
+    battle_profile = unit_data.get('battleProfile', {})
+    if battle_profile.get('isManifestation'):
+        return 'manifestation'
+    if battle_profile.get('isFactionTerrain'):
+        return 'faction terrain'
+    if json_file.stem in legends:
+        return 'Warhammer Legends'
+    return None
+
+def load_legends_units():
+    """Load faction slug -> Warhammer Legends unit file stems."""
+    with open(LEGENDS_UNITS_PATH, 'r', encoding='utf-8') as f:
+        return {faction: set(stems) for faction, stems in json.load(f).items()}
+
+def load_points_history():
+    """Load the points history store, or an empty one."""
+    if POINTS_HISTORY_PATH.exists():
+        with open(POINTS_HISTORY_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'publications': {}}
+
+def record_publication(history, filepath, index):
+    """Record one parsed file's points under its publication date.
+
+    Args:
+        history: Points history store, updated in place
+        filepath: Battle Profile txt file the index was built from
+        index: Section index from build_profile_index
+
+    Returns:
+        True if the store changed
+    """
+    publication = read_publication(filepath)
+    if publication is None:
+        print(f"  Warning: No publication date in {filepath.name}; not recorded in points history")
+        return False
+
+    entry = history['publications'].setdefault(publication, {'sources': [], 'sections': {}})
+    before = json.dumps(entry, sort_keys=True)
+    if filepath.name not in entry['sources']:
+        entry['sources'] = sorted(entry['sources'] + [filepath.name])
+    for title, (units, _) in index.items():
+        entry['sections'][title] = {
+            name: {'points': profile['points'],
+                   **{k: profile[k] for k in HISTORY_FIELDS if k in profile}}
+            for name, profile in usable_rows(units).items()
+        }
+    return json.dumps(entry, sort_keys=True) != before
+
+def changes_in_publication(history, publication):
+    """List the units that changed in a publication.
+
+    A unit changed if its row was marked ✹, printed a points delta, or its
+    points differ from the most recent earlier publication that lists it.
+
+    Returns:
+        List of dicts with section, name, points, pointsChange, updated and
+        previousPoints (None when no earlier publication lists the unit)
+    """
+    publications = sorted(history['publications'])
+    earlier = [history['publications'][p]['sections'] for p in publications if p < publication]
+    changes = []
+    for title, units in history['publications'][publication]['sections'].items():
+        for name, record in units.items():
+            previous = next((sections[title][name]['points'] for sections in reversed(earlier)
+                             if name in sections.get(title, {})), None)
+            if record.get('updated') or record.get('pointsChange') or \
+                    (previous is not None and previous != record['points']):
+                changes.append({
+                    'section': title,
+                    'name': name,
+                    'points': record['points'],
+                    'pointsChange': record.get('pointsChange'),
+                    'updated': record.get('updated', False),
+                    'previousPoints': previous,
+                })
+    return changes
+
+def print_changes(publication=None):
+    """Print what changed in a publication (default: the latest recorded)."""
+    history = load_points_history()
+    if not history['publications']:
+        print(f"No publications recorded in {POINTS_HISTORY_PATH}")
+        return False
+    publication = publication or max(history['publications'])
+    if publication not in history['publications']:
+        print(f"Publication {publication} not recorded; have: {', '.join(sorted(history['publications']))}")
+        return False
+
+    changes = changes_in_publication(history, publication)
+    print(f"{len(changes)} changed units in {publication}:")
+    section = None
+    for change in changes:
+        if change['section'] != section:
+            section = change['section']
+            print(f"\n  {section}")
+        delta = f" ({change['pointsChange']:+d})" if change['pointsChange'] else ''
+        previous = f", was {change['previousPoints']}" if change['previousPoints'] is not None else ''
+        print(f"    {'✹' if change['updated'] else ' '} {change['name']}: {change['points']}{delta}{previous}")
+    return True
+
+def update_all(factions, pipeline=False, workers=0, writers=4, dry_run=False):
+    """Update every faction, then write factions.json once.
+
+    Args:
+        factions: List of (faction_slug, battle_profile_filename, faction_name_in_file)
+        pipeline: Parse sections on a process pool and write unit files on
+                  writer threads instead of one after another
+        workers: Parser processes for pipeline mode (0 = one per CPU core)
+        writers: Writer threads for pipeline mode
+        dry_run: Compute the change set without writing unit files,
+                 factions.json or the points history
+
+    Returns:
+        Change report: per-faction unit results, formation changes and totals
+    """
+    start = time.perf_counter()
+
+    # Battle Profiles.txt is shared by several factions; scan each file once
+    profile_indexes = {}
+    writer = None
+    if pipeline:
+        paths = list(dict.fromkeys(
+            BATTLE_PROFILES_DIR / filename for _, filename, _ in factions
+            if (BATTLE_PROFILES_DIR / filename).exists()
+        ))
+        workers = workers if workers > 0 else (os.cpu_count() or 1)
+        print(f"Parsing {len(paths)} Battle Profile files across {workers} workers...")
+        profile_indexes = build_profile_indexes(paths, workers)
+        if not dry_run:
+            writer = UnitWriter(writers)
+
+    formation_updates = {}
+    report = {'dryRun': dry_run, 'factions': {}, 'formations': [],
+              'totals': {'updated': 0, 'unchanged': 0, 'ambiguous': 0, 'unmatched': 0,
+                         'excluded': 0, 'errors': 0}}
+    legends = load_legends_units()
+    totals = report['totals']
+    try:
+        for faction_slug, profile_filename, faction_name in factions:
+            result = update_faction_data(faction_slug, profile_filename, faction_name,
+                                         profile_indexes, writer, dry_run,
+                                         legends.get(faction_slug, ()))
+            if result['battleFormations']:
+                formation_updates[faction_slug] = result['battleFormations']
+            for key in ('updated', 'unchanged', 'ambiguous', 'unmatched', 'excluded'):
+                totals[key] += result[key]
+            totals['errors'] += result['error'] is not None
+            report['factions'][faction_slug] = {
+                'error': result['error'],
+                'units': result['units'],
+                'rejectedRows': result['rejectedRows'],
+            }
+    finally:
+        if writer is not None:
+            writer.close()
+
+    # factions.json is shared by every faction, so write it once at the end
+    report['formations'] = write_battle_formations(formation_updates, dry_run)
+
+    if not dry_run:
+        history = load_points_history()
+        recorded = [path.name for path, index in profile_indexes.items()
+                    if record_publication(history, path, index)]
+        if recorded:
+            write_json_atomic(POINTS_HISTORY_PATH, history)
+            print(f"Recorded points history for: {', '.join(recorded)}")
+
+    verb = 'would be updated' if dry_run else 'updated'
+    print(f"\n✓ {len(factions)} factions in {time.perf_counter() - start:.1f}s: "
+          f"{totals['updated']} unit files {verb}, {totals['unchanged']} unchanged, "
+          f"{totals['ambiguous']} ambiguous, {totals['unmatched']} unmatched, "
+          f"{totals['excluded']} excluded")
+    return report
+
+def check_fixtures(path=ROW_FIXTURES_PATH):
+    """Parse each fixture's table lines and compare the rows with its expectations.
+
+    A fixture expects a subset of each named row's fields ('rejected' as the
+    list of rejected columns), or null for a name that must not be parsed.
+
+    Returns:
+        True if every fixture passed
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)
+
+    failures = 0
+    for fixture in fixtures:
+        rows = extract_profile_rows('\n'.join(fixture['lines']))
+        problems = []
+        for name, expected in fixture['expect'].items():
+            if expected is None:
+                if name in rows:
+                    problems.append(f"{name!r} should not be parsed")
+                continue
+            if name not in rows:
+                problems.append(f"{name!r} not parsed")
+                continue
+            actual = {**rows[name], 'rejected': sorted(rows[name].get('rejected', {}))}
+            expected = {'rejected': [], **expected}
+            problems.extend(f"{name!r} {key}: expected {value!r}, got {actual.get(key)!r}"
+                            for key, value in expected.items() if actual.get(key) != value)
+        if problems:
+            failures += 1
+            print(f"✗ {fixture['case']} ({fixture['source']})")
+            for problem in problems:
+                print(f"    {problem}")
+        else:
+            print(f"✓ {fixture['case']}")
+    print(f"\n{len(fixtures) - failures}/{len(fixtures)} fixtures passed")
+    return failures == 0
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Update unit battle profiles and faction battle formations from Battle Profile text files.")
+    parser.add_argument('--faction', action='append',
+                        help="Only update this faction slug (repeatable)")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="Parse faction sections on a process pool and queue unit file writes")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Parser processes for --pipeline (0 = one per CPU core)")
+    parser.add_argument('--writers', type=int, default=4,
+                        help="Writer threads for --pipeline")
+    parser.add_argument('--changes', nargs='?', const='', metavar='PUBLICATION',
+                        help="List units changed in a recorded publication (e.g. 2025-09; "
+                             "default: latest) and exit")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Compute the changes without writing any files; "
+                             "exit 1 if any unit matches no profile row")
+    parser.add_argument('--report', choices=['text', 'json'], default='text',
+                        help="With json, print the change report to stdout as JSON "
+                             "and progress to stderr")
+    parser.add_argument('--check-fixtures', action='store_true',
+                        help=f"Check the row parser against {ROW_FIXTURES_PATH.name} and exit")
+    args = parser.parse_args()
+
+    if args.check_fixtures:
+        sys.exit(0 if check_fixtures() else 1)
+
+    if args.changes is not None:
+        sys.exit(0 if print_changes(args.changes or None) else 1)
+
+    factions = FACTIONS
+    if args.faction:
+        unknown = sorted(set(args.faction) - {slug for slug, _, _ in FACTIONS})
+        if unknown:
+            parser.error(f"unknown faction(s): {', '.join(unknown)}")
+        factions = [faction for faction in FACTIONS if faction[0] in args.faction]
+
+    # Keep stdout for the JSON report alone
+    log = sys.stderr if args.report == 'json' else sys.stdout
+    with contextlib.redirect_stdout(log):
+        print("="*60)
+        print("Updating Unit Points and Battle Formations" + (" (dry run)" if args.dry_run else ""))
+        print("="*60)
+
+        report = update_all(factions, args.pipeline, args.workers, max(args.writers, 1), args.dry_run)
+
+        print("\n" + "="*60)
+        print("✅ Done!")
+        print("="*60)
+
+    if args.report == 'json':
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write('\n')
+
+    if args.dry_run and (report['totals']['unmatched'] or report['totals']['errors']):
+        sys.exit(1)
 
 if __name__ == "__main__":
-    print("="*60)
-    print("Updating Unit Points and Battle Formations")
-    print("="*60)
-
-    # Map faction slugs to their Battle Profile txt files
-    # Format: (faction_slug, battle_profile_filename, faction_name_in_file)
-    # faction_name_in_file is only needed for factions in the main Battle Profiles.txt
-    factions = [
-        ('flesh-eater-courts', 'Battle Profile - Flesh Eater Courts.txt', None),
-        ('ossiarch-bonereapers', 'Battle Profiles.txt', 'OSSIARCH BONEREAPERS'),
-        ('slaves-to-darkness', 'Battle Profiles.txt', 'SLAVES TO DARKNESS'),
-        ('stormcast-eternals', 'Battle Profiles.txt', 'STORMCAST ETERNALS'),
-    ]
-
-    for faction_slug, profile_filename, faction_name in factions:
-        update_faction_data(faction_slug, profile_filename, faction_name)
-
-    print("\n" + "="*60)
-    print("✅ Done!")
-    print("="*60)
+    main()
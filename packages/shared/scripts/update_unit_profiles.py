@@ -1,628 +1,255 @@
 #!/usr/bin/env python3
 """
-Update all unit JSON files with battle profile data
+Apply battle profile tables to unit JSON files.
+
+Profiles come from the Battle Profile txt files (parsed by update_unit_points)
+or from a JSON/CSV table. Every matching unit file across all factions is
+upserted in one pass: the table's columns replace their old battleProfile
+values, other keys are kept, and files are only rewritten when they change.
+
+Usage:
+    python update_unit_profiles.py
+    python update_unit_profiles.py --input profiles.json
+    python update_unit_profiles.py --input profiles.csv --faction flesh-eater-courts
+    python update_unit_profiles.py --dry-run
+
+JSON input maps faction slug -> unit id or name -> battleProfile columns:
+
+    {"flesh-eater-courts": {"abhorrant-cardinal": {"unitSize": 1, "points": 130}}}
+
+Columns are checked the same way for both formats: a column not listed below,
+or a value of the wrong type, stops the run before any file is written.
+
+CSV input has a header row with faction, unit and any of unitSize, points,
+regimentOptions, keywords (comma separated), notes and baseSize; empty cells
+are left out.
 """
 
+import argparse
+import csv
 import json
-import os
+import sys
 from pathlib import Path
 
-# Base path for unit files
-UNITS_BASE = Path("/Users/kwhitejr/Projects/github/path-to-glory/packages/shared/data/units")
-
-# Flesh Eater Courts battle profile data
-FEC_PROFILES = {
-    "abhorrant-cardinal": {
-        "unitSize": 1,
-        "points": 130,
-        "regimentOptions": "0-1 Royal Attendant, 0-1 Beast, 0-1 Knights, Any Serfs",
-        "baseSize": "32mm"
-    },
-    "abhorrant-ghoul-king": {
-        "unitSize": 1,
-        "points": 120,
-        "regimentOptions": "0-1 Royal Attendant, Any Flesh-eater Courts",
-        "baseSize": "32mm"
-    },
-    "abhorrant-ghoul-king-on-terrorgheist": {
-        "unitSize": 1,
-        "points": 350,
-        "regimentOptions": "0-1 Royal Attendant, Any Flesh-eater Courts",
-        "baseSize": "130mm"
-    },
-    "abhorrant-ghoul-king-on-zombie-dragon": {
-        "unitSize": 1,
-        "points": 360,
-        "regimentOptions": "0-1 Royal Attendant, Any Flesh-eater Courts",
-        "baseSize": "130mm"
-    },
-    "abhorrant-gorewarden": {
-        "unitSize": 1,
-        "points": 170,
-        "regimentOptions": "0-1 Royal Attendant, 0-1 Beast, 0-1 Serfs, Any Knights",
-        "baseSize": "40mm"
-    },
-    "crypt-haunter-courtier": {
-        "unitSize": 1,
-        "points": 120,
-        "regimentOptions": "0-1 Beast, 0-1 Serfs, Any Crypt Horrors",
-        "notes": "This Hero can join an eligible regiment as a Royal Attendant.",
-        "baseSize": "50mm"
-    },
-    "crypt-infernal-courtier": {
-        "unitSize": 1,
-        "points": 140,
-        "regimentOptions": "0-1 Beast, 0-1 Serfs, Any Crypt Flayers",
-        "notes": "This Hero can join an eligible regiment as a Royal Attendant.",
-        "baseSize": "50mm"
-    },
-    "grand-justice-gormayne": {
-        "unitSize": 1,
-        "points": 110,
-        "regimentOptions": "0-1 Beast, 0-1 Knights, Any Serfs",
-        "notes": "This Hero can join an eligible regiment as a Royal Attendant.",
-        "baseSize": "32mm"
-    },
-    "marrowscroll-herald": {
-        "unitSize": 1,
-        "points": 110,
-        "regimentOptions": "0-1 Beast, Any Serfs",
-        "notes": "This Hero can join an eligible regiment as a Royal Attendant.",
-        "baseSize": "32mm"
-    },
-    "royal-decapitator": {
-        "unitSize": 1,
-        "points": 100,
-        "regimentOptions": "0-1 Beast, Any Serfs",
-        "notes": "This Hero can join an eligible regiment as a Royal Attendant.",
-        "baseSize": "32mm"
-    },
-    "ushoran": {
-        "unitSize": 1,
-        "points": 450,
-        "regimentOptions": "Any Royal Attendant, Any Flesh-eater Courts",
-        "baseSize": "130mm"
-    },
-    "crypt-flayers": {
-        "unitSize": 3,
-        "points": 150,
-        "keywords": ["Knights", "Infantry"],
-        "baseSize": "50mm"
-    },
-    "crypt-horrors": {
-        "unitSize": 3,
-        "points": 160,
-        "keywords": ["Knights", "Infantry"],
-        "baseSize": "50mm"
-    },
-    "cryptguard": {
-        "unitSize": 10,
-        "points": 100,
-        "keywords": ["Serfs", "Infantry"],
-        "baseSize": "25mm"
-    },
-    "morbheg-knights": {
-        "unitSize": 3,
-        "points": 180,
-        "keywords": ["Knights", "Cavalry"],
-        "baseSize": "75 × 42mm"
-    },
-    "royal-beastflayers": {
-        "unitSize": 10,
-        "points": 100,
-        "keywords": ["Serfs", "Infantry"],
-        "notes": "This unit cannot be reinforced.",
-        "baseSize": "40mm, 32mm, 28.5mm, 25mm"
-    },
-    "royal-terrorgheist": {
-        "unitSize": 1,
-        "points": 230,
-        "keywords": ["Monster"],
-        "baseSize": "130mm"
-    },
-    "royal-zombie-dragon": {
-        "unitSize": 1,
-        "points": 240,
-        "keywords": ["Monster"],
-        "baseSize": "130mm"
-    },
-    "varghulf-courtier": {
-        "unitSize": 1,
-        "points": 130,
-        "keywords": ["Beast"],
-        "baseSize": "90 × 52mm"
-    }
-}
-
-# Ossiarch Bonereapers battle profile data
-OBR_PROFILES = {
-    "arch-kavalos-zandtos": {
-        "unitSize": 1,
-        "points": 190,
-        "regimentOptions": "Any Ossiarch Bonereapers",
-        "notes": "This Hero can join an eligible regiment as a Legion Subcommander.",
-        "baseSize": "80mm"
-    },
-    "liege-kavalos": {
-        "unitSize": 1,
-        "points": 160,
-        "regimentOptions": "Any Ossiarch Bonereapers",
-        "notes": "This Hero can join an eligible regiment as a Legion Subcommander.",
-        "baseSize": "80mm"
-    },
-    "mortisan-boneshaper": {
-        "unitSize": 1,
-        "points": 110,
-        "regimentOptions": "0-1 Gothizzar Harvester, Any Infantry",
-        "baseSize": "32mm"
-    },
-    "mortisan-ossifector": {
-        "unitSize": 1,
-        "points": 110,
-        "regimentOptions": "0-1 Gothizzar Harvester, 0-1 Mortek Crawler, Any Infantry",
-        "baseSize": "32mm"
-    },
-    "mortisan-soulmason": {
-        "unitSize": 1,
-        "points": 150,
-        "regimentOptions": "0-1 Gothizzar Harvester, Any Infantry",
-        "baseSize": "40mm"
-    },
-    "mortisan-soulreaper": {
-        "unitSize": 1,
-        "points": 90,
-        "regimentOptions": "0-1 Gothizzar Harvester, Any Infantry",
-        "baseSize": "32mm"
-    },
-    "vokmortian": {
-        "unitSize": 1,
-        "points": 150,
-        "regimentOptions": "Any Ossiarch Bonereapers",
-        "baseSize": "40mm"
-    },
-    "gothizzar-harvester": {
-        "unitSize": 1,
-        "points": 140,
-        "keywords": ["Monster"],
-        "baseSize": "105 × 70mm"
-    },
-    "immortis-guard": {
-        "unitSize": 3,
-        "points": 170,
-        "keywords": ["Infantry"],
-        "baseSize": "50mm"
-    },
-    "kavalos-deathriders": {
-        "unitSize": 5,
-        "points": 200,
-        "keywords": ["Cavalry"],
-        "baseSize": "60 × 35mm"
-    },
-    "morghast-archai": {
-        "unitSize": 2,
-        "points": 260,
-        "keywords": ["Infantry"],
-        "baseSize": "60mm"
-    },
-    "morghast-harbingers": {
-        "unitSize": 2,
-        "points": 260,
-        "keywords": ["Infantry"],
-        "baseSize": "60mm"
-    },
-    "mortek-crawler": {
-        "unitSize": 1,
-        "points": 260,
-        "keywords": ["War Machine"],
-        "baseSize": "170 × 105mm"
-    },
-    "mortek-guard": {
-        "unitSize": 10,
-        "points": 110,
-        "keywords": ["Infantry"],
-        "baseSize": "25mm"
-    },
-    "necropolis-stalkers": {
-        "unitSize": 3,
-        "points": 140,
-        "keywords": ["Infantry"],
-        "baseSize": "50mm"
-    }
-}
-
-# Slaves to Darkness battle profile data
-STD_PROFILES = {
-    "chaos-lord": {
-        "unitSize": 1,
-        "points": 100,
-        "regimentOptions": "0-1 Ruinous Champion, Any Slaves to Darkness",
-        "notes": "This Hero can join an eligible regiment as a Ruinous Champion.",
-        "baseSize": "40mm"
-    },
-    "chaos-lord-on-daemonic-mount": {
-        "unitSize": 1,
-        "points": 140,
-        "regimentOptions": "0-1 Ruinous Champion, Any Slaves to Darkness",
-        "notes": "This Hero can join an eligible regiment as a Ruinous Champion.",
-        "baseSize": "90 × 52mm"
-    },
-    "chaos-lord-on-karkadrak": {
-        "unitSize": 1,
-        "points": 200,
-        "regimentOptions": "0-1 Ruinous Champion, Any Slaves to Darkness",
-        "notes": "This Hero can join an eligible regiment as a Ruinous Champion.",
-        "baseSize": "90 × 52mm"
-    },
-    "chaos-sorcerer-lord": {
-        "unitSize": 1,
-        "points": 120,
-        "regimentOptions": "0-1 Ruinous Champion, 0-1 Monster, Any Warriors of Chaos",
-        "baseSize": "40mm"
-    },
-    "daemon-prince": {
-        "unitSize": 1,
-        "points": 260,
-        "regimentOptions": "0-1 Ruinous Champion, Any Slaves to Darkness",
-        "baseSize": "60mm"
-    },
-    "darkoath-chieftain": {
-        "unitSize": 1,
-        "points": 80,
-        "regimentOptions": "0-1 Monster, Any Darkoath",
-        "notes": "This Hero can join an eligible regiment as an Oathsworn.",
-        "baseSize": "32mm"
-    },
-    "darkoath-chieftain-on-warsteed": {
-        "unitSize": 1,
-        "points": 110,
-        "regimentOptions": "0-1 Oathsworn, 0-1 Monster, Any Darkoath",
-        "notes": "This Hero can join an eligible regiment as an Oathsworn.",
-        "baseSize": "75 × 42mm"
-    },
-    "darkoath-warqueen": {
-        "unitSize": 1,
-        "points": 100,
-        "regimentOptions": "0-1 Oathsworn, 0-1 Monster, Any Darkoath",
-        "baseSize": "32mm"
-    },
-    "exalted-hero-of-chaos": {
-        "unitSize": 1,
-        "points": 90,
-        "regimentOptions": "0-1 Monster, Any Warriors of Chaos",
-        "notes": "This Hero can join an eligible regiment as a Ruinous Champion.",
-        "baseSize": "40mm"
-    },
-    "gaunt-summoner": {
-        "unitSize": 1,
-        "points": 180,
-        "regimentOptions": "Any Slaves to Darkness",
-        "baseSize": "40mm"
-    },
-    "ogroid-myrmidon": {
-        "unitSize": 1,
-        "points": 120,
-        "regimentOptions": "Any Ogroid Theridons, Any Monster, Any Daemon",
-        "notes": "This Hero can join an eligible regiment as a Ruinous Champion.",
-        "baseSize": "50mm"
-    },
-    "chaos-chariot": {
-        "unitSize": 1,
-        "points": 90,
-        "keywords": ["Warriors of Chaos", "War Machine"],
-        "baseSize": "120 × 92mm"
-    },
-    "chaos-chosen": {
-        "unitSize": 5,
-        "points": 280,
-        "keywords": ["Warriors of Chaos", "Infantry"],
-        "baseSize": "40mm"
-    },
-    "chaos-furies": {
-        "unitSize": 6,
-        "points": 120,
-        "keywords": ["Daemon", "Infantry"],
-        "baseSize": "32mm"
-    },
-    "chaos-knights": {
-        "unitSize": 5,
-        "points": 250,
-        "keywords": ["Warriors of Chaos", "Cavalry"],
-        "baseSize": "75 × 42mm"
-    },
-    "chaos-marauders": {
-        "unitSize": 10,
-        "points": 80,
-        "keywords": ["Darkoath", "Infantry"],
-        "baseSize": "28.5mm"
-    },
-    "chaos-spawn": {
-        "unitSize": 1,
-        "points": 60,
-        "keywords": ["Beast"],
-        "baseSize": "50mm"
-    },
-    "chaos-warriors": {
-        "unitSize": 10,
-        "points": 200,
-        "keywords": ["Warriors of Chaos", "Infantry"],
-        "baseSize": "32mm"
-    },
-    "darkoath-fellriders": {
-        "unitSize": 5,
-        "points": 150,
-        "keywords": ["Darkoath", "Cavalry"],
-        "baseSize": "60 × 35mm"
-    },
-    "darkoath-savagers": {
-        "unitSize": 10,
-        "points": 90,
-        "keywords": ["Darkoath", "Infantry"],
-        "notes": "This unit cannot be reinforced.",
-        "baseSize": "32mm [3], 28.5mm [7]"
-    },
-    "darkoath-wilderfiend": {
-        "unitSize": 1,
-        "points": 130,
-        "keywords": ["Darkoath", "Beast"],
-        "baseSize": "60mm"
-    },
-    "gorebeast-chariot": {
-        "unitSize": 1,
-        "points": 100,
-        "keywords": ["Warriors of Chaos", "War Machine"],
-        "baseSize": "120 × 92mm"
-    },
-    "ogroid-theridons": {
-        "unitSize": 3,
-        "points": 180,
-        "keywords": ["Infantry"],
-        "baseSize": "50mm"
-    },
-    "raptoryx": {
-        "unitSize": 6,
-        "points": 100,
-        "keywords": ["Beast"],
-        "baseSize": "60 × 35mm"
-    },
-    "varanguard": {
-        "unitSize": 3,
-        "points": 330,
-        "keywords": ["Warriors of Chaos", "Cavalry"],
-        "baseSize": "75 × 42mm"
-    }
-}
-
-# Stormcast Eternals battle profile data
-SCE_PROFILES = {
-    "knight-arcanum": {
-        "unitSize": 1,
-        "points": 120,
-        "regimentOptions": "0-1 Gryph-hounds, Any Warrior Chamber",
-        "baseSize": "40mm"
-    },
-    "knight-azyros": {
-        "unitSize": 1,
-        "points": 120,
-        "regimentOptions": "0-1 Warrior Chamber, Any Ruination Chamber",
-        "notes": "This Hero can join an eligible regiment as a Stormcast Exemplar.",
-        "baseSize": "50mm"
-    },
-    "knight-questor": {
-        "unitSize": 1,
-        "points": 110,
-        "regimentOptions": "0-1 Questor Soulsworn, 0-1 Gryph-hounds, Any Ruination Chamber",
-        "notes": "This Hero can join an eligible regiment as a Stormcast Exemplar.",
-        "baseSize": "40mm"
-    },
-    "knight-relictor": {
-        "unitSize": 1,
-        "points": 120,
-        "regimentOptions": "0-1 Gryph-hounds, Any Warrior Chamber",
-        "baseSize": "40mm"
-    },
-    "knight-vexillor": {
-        "unitSize": 1,
-        "points": 100,
-        "regimentOptions": "0-1 Gryph-hounds, Any Warrior Chamber",
-        "notes": "This Hero can join an eligible regiment as a Stormcast Exemplar.",
-        "baseSize": "40mm"
-    },
-    "lord-aquilor": {
-        "unitSize": 1,
-        "points": 140,
-        "regimentOptions": "Any Gryph-hounds, Any Vanguard Chamber",
-        "baseSize": "90 × 52mm"
-    },
-    "lord-celestant": {
-        "unitSize": 1,
-        "points": 100,
-        "regimentOptions": "0-1 Stormcast Exemplar, 0-1 Gryph-hounds, Any Warrior Chamber",
-        "baseSize": "40mm"
-    },
-    "lord-celestant-on-dracoth": {
-        "unitSize": 1,
-        "points": 160,
-        "regimentOptions": "0-1 Stormcast Exemplar, Any Extremis Chamber, Any Warrior Chamber",
-        "baseSize": "90 × 52mm"
-    },
-    "lord-imperatant": {
-        "unitSize": 1,
-        "points": 110,
-        "regimentOptions": "0-1 Stormcast Exemplar, 0-1 Gryph-hounds, Any Warrior Chamber",
-        "notes": "This Hero can join an eligible regiment as a Stormcast Exemplar.",
-        "baseSize": "40mm [1], 32mm [1]"
-    },
-    "lord-relictor": {
-        "unitSize": 1,
-        "points": 120,
-        "regimentOptions": "0-1 Stormcast Exemplar, 0-1 Gryph-hounds, Any Ruination Chamber, Any Warrior Chamber",
-        "baseSize": "40mm"
-    },
-    "lord-veritant": {
-        "unitSize": 1,
-        "points": 110,
-        "regimentOptions": "0-1 Stormcast Exemplar, 0-1 Gryph-hounds, Any Ruination Chamber, Any Warrior Chamber",
-        "baseSize": "40mm"
-    },
-    "vandus-hammerhand": {
-        "unitSize": 1,
-        "points": 170,
-        "regimentOptions": "0-1 Stormcast Exemplar, Any Extremis Chamber, Any Warrior Chamber",
-        "baseSize": "90 × 52mm"
-    },
-    "annihilators": {
-        "unitSize": 3,
-        "points": 130,
-        "keywords": ["Warrior Chamber", "Infantry"],
-        "baseSize": "40mm"
-    },
-    "gryph-hounds": {
-        "unitSize": 6,
-        "points": 90,
-        "keywords": ["Beast"],
-        "baseSize": "40mm"
-    },
-    "liberators": {
-        "unitSize": 5,
-        "points": 90,
-        "keywords": ["Warrior Chamber", "Infantry"],
-        "baseSize": "40mm"
-    },
-    "praetors": {
-        "unitSize": 3,
-        "points": 140,
-        "keywords": ["Warrior Chamber", "Infantry"],
-        "baseSize": "40mm"
-    },
-    "prosecutors": {
-        "unitSize": 3,
-        "points": 150,
-        "keywords": ["Ruination Chamber", "Infantry"],
-        "baseSize": "40mm"
-    },
-    "questor-soulsworn": {
-        "unitSize": 6,
-        "points": 200,
-        "keywords": ["Warrior Chamber", "Infantry"],
-        "notes": "This unit cannot be reinforced.",
-        "baseSize": "40mm"
-    },
-    "reclusians": {
-        "unitSize": 3,
-        "points": 140,
-        "keywords": ["Ruination Chamber", "Infantry"],
-        "baseSize": "40mm"
-    },
-    "stormstrike-chariot": {
-        "unitSize": 1,
-        "points": 120,
-        "keywords": ["Warrior Chamber", "War Machine"],
-        "baseSize": "120 × 92mm"
-    },
-    "vanguard-hunters": {
-        "unitSize": 5,
-        "points": 120,
-        "keywords": ["Vanguard Chamber", "Infantry"],
-        "baseSize": "40mm"
-    },
-    "vanguard-raptors-with-hurricane-crossbows": {
-        "unitSize": 3,
-        "points": 110,
-        "keywords": ["Vanguard Chamber", "Infantry"],
-        "baseSize": "40mm"
-    },
-    "vanguard-raptors-with-longstrike-crossbows": {
-        "unitSize": 3,
-        "points": 200,
-        "keywords": ["Vanguard Chamber", "Infantry"],
-        "notes": "Champion is 60 × 35mm.",
-        "baseSize": "40mm"
-    },
-    "vanquishers": {
-        "unitSize": 5,
-        "points": 100,
-        "keywords": ["Warrior Chamber", "Infantry"],
-        "baseSize": "40mm"
-    },
-    "vigilors": {
-        "unitSize": 5,
-        "points": 140,
-        "keywords": ["Warrior Chamber", "Infantry"],
-        "baseSize": "40mm"
-    },
-    "vindictors": {
-        "unitSize": 5,
-        "points": 100,
-        "keywords": ["Warrior Chamber", "Infantry"],
-        "baseSize": "40mm"
-    }
-}
-
-def update_unit_file(faction_dir, unit_id, profile_data):
-    """Update a single unit JSON file with battle profile data"""
-    file_path = faction_dir / f"{unit_id}.json"
-
-    if not file_path.exists():
-        return False
-
-    try:
-        with open(file_path, 'r') as f:
-            unit_data = json.load(f)
-
-        # Skip if already has battleProfile
-        if 'battleProfile' in unit_data:
-            return False
-
-        # Add battle profile
-        unit_data['battleProfile'] = profile_data
-
-        # Write back
-        with open(file_path, 'w') as f:
-            json.dump(unit_data, f, indent=2)
-            f.write('\n')  # Add trailing newline
-
-        return True
-    except Exception as e:
-        print(f"Error updating {file_path}: {e}")
-        return False
+from update_unit_points import (
+    BATTLE_PROFILES_DIR,
+    FACTIONS,
+    UNITS_DIR,
+    build_name_index,
+    load_profile_index,
+    match_unit,
+    merge_battle_profile,
+    profile_columns,
+    usable_rows,
+    write_unit_json,
+)
+
+PROFILE_COLUMNS = ('unitSize', 'points', 'regimentOptions', 'keywords', 'notes', 'baseSize')
+
+def profiles_from_text(factions=FACTIONS):
+    """Parse each faction's profile table from the Battle Profile txt files.
+
+    Returns:
+        Dict of faction slug -> profile name -> battleProfile columns
+    """
+    profile_indexes = {}
+    tables = {}
+    for faction_slug, battle_profile_filename, faction_name_in_file in factions:
+        battle_profile_path = BATTLE_PROFILES_DIR / battle_profile_filename
+        if not battle_profile_path.exists():
+            print(f"Warning: Battle profile not found at {battle_profile_path}")
+            continue
+        index = load_profile_index(battle_profile_path, profile_indexes)
+        if faction_name_in_file and faction_name_in_file not in index:
+            print(f"Warning: Could not find section for {faction_name_in_file}")
+            continue
+        sections = [index[faction_name_in_file]] if faction_name_in_file else index.values()
+
+        table = tables.setdefault(faction_slug, {})
+        for units, _ in sections:
+            for name, profile in usable_rows(units).items():
+                table[name] = profile_columns(profile)
+    return tables
+
+def parse_csv_value(column, value):
+    """Convert one CSV cell to its battleProfile type."""
+    if column == 'points':
+        return int(value)
+    if column == 'unitSize':
+        return int(value) if value.isdigit() else value
+    if column == 'keywords':
+        return [keyword.strip() for keyword in value.split(',') if keyword.strip()]
+    return value
+
+def parse_json_row(row):
+    """Check one JSON profile row's columns and convert them as parse_csv_value does.
+
+    Strings are parsed like CSV cells; numbers and keyword lists must already
+    have their battleProfile type.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("expected an object of battleProfile columns")
+    unknown = sorted(set(row) - set(PROFILE_COLUMNS))
+    if unknown:
+        raise ValueError(f"unknown column(s): {', '.join(unknown)}")
+
+    profile = {}
+    for column, value in row.items():
+        if isinstance(value, str):
+            value = parse_csv_value(column, value.strip())
+        elif column in ('unitSize', 'points') and isinstance(value, int) and not isinstance(value, bool):
+            pass
+        elif column == 'keywords' and isinstance(value, list) and all(isinstance(k, str) for k in value):
+            pass
+        else:
+            raise ValueError(f"invalid {column}: {value!r}")
+        profile[column] = value
+    return profile
+
+def profiles_from_file(input_path):
+    """Load a JSON or CSV profile table.
+
+    Returns:
+        Dict of faction slug -> unit id or name -> battleProfile columns
+    """
+    if input_path.suffix.lower() == '.json':
+        with open(input_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{input_path.name}: expected an object of faction slug -> units")
+        tables = {}
+        for faction_slug, units in data.items():
+            if not isinstance(units, dict):
+                raise ValueError(f"{input_path.name}: {faction_slug}: expected an object of unit -> columns")
+            for unit, row in units.items():
+                try:
+                    profile = parse_json_row(row)
+                except ValueError as e:
+                    raise ValueError(f"{input_path.name}: {faction_slug}/{unit}: {e}") from e
+                tables.setdefault(faction_slug, {})[unit] = profile
+        return tables
+
+    if input_path.suffix.lower() != '.csv':
+        raise ValueError(f"Unsupported input format: {input_path.suffix} (expected .json or .csv)")
+
+    tables = {}
+    with open(input_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        missing = {'faction', 'unit'} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"{input_path.name} is missing column(s): {', '.join(sorted(missing))}")
+        for line_number, row in enumerate(reader, start=2):
+            try:
+                profile = {
+                    column: parse_csv_value(column, row[column].strip())
+                    for column in PROFILE_COLUMNS if (row.get(column) or '').strip()
+                }
+            except ValueError as e:
+                raise ValueError(f"{input_path.name}:{line_number}: {e}") from e
+            tables.setdefault(row['faction'].strip(), {})[row['unit'].strip()] = profile
+    return tables
+
+def find_profile(unit_data, json_file, table, name_index):
+    """Find a unit's profile by id, then by (subtitled) name.
+
+    Returns:
+        (key, profile), or (None, tied keys) if nothing matched
+    """
+    for key in (json_file.stem, unit_data.get('id')):
+        if key in table:
+            return key, table[key]
+
+    key, tied, _ = match_unit(unit_data, name_index)
+    if key is None:
+        return None, tied
+    return key, table[key]
+
+def apply_profiles(tables, dry_run=False):
+    """Upsert every faction's profile table into its unit files.
+
+    Args:
+        tables: Dict of faction slug -> unit id or name -> battleProfile columns
+        dry_run: Report changes without writing
+
+    Returns:
+        Dict of counts: updated, unchanged, unmatched (table rows no unit
+        file used) and ambiguous (unit files matching several rows equally
+        well)
+    """
+    totals = {'updated': 0, 'unchanged': 0, 'unmatched': 0, 'ambiguous': 0}
+
+    for faction_slug, table in tables.items():
+        faction_dir = UNITS_DIR / faction_slug
+        if not faction_dir.exists():
+            print(f"✗ {faction_slug}: unit directory not found: {faction_dir}")
+            totals['unmatched'] += len(table)
+            continue
+
+        name_index = build_name_index(table)
+        used = set()
+        counts = {'updated': 0, 'unchanged': 0}
+        for json_file in sorted(faction_dir.glob("*.json")):
+            with open(json_file, 'r', encoding='utf-8') as f:
+                unit_data = json.load(f)
+
+            key, profile = find_profile(unit_data, json_file, table, name_index)
+            if key is None:
+                if profile:
+                    print(f"    ? {unit_data.get('name', json_file.stem)}: ambiguous, candidates {', '.join(profile)}")
+                    totals['ambiguous'] += 1
+                continue
+            used.add(key)
+
+            old_profile = unit_data.get('battleProfile', {})
+            battle_profile = merge_battle_profile(old_profile, profile)
+            if battle_profile == old_profile:
+                counts['unchanged'] += 1
+                continue
+
+            changed = sorted(k for k in profile if old_profile.get(k) != profile[k])
+            print(f"    {unit_data.get('name', json_file.stem)}: {', '.join(changed)}")
+            unit_data['battleProfile'] = battle_profile
+            if not dry_run:
+                write_unit_json(json_file, unit_data)
+            counts['updated'] += 1
+
+        unused = sorted(set(table) - used)
+        print(f"✓ {faction_slug}: {counts['updated']} updated, {counts['unchanged']} unchanged"
+              + (f", {len(unused)} rows without a unit file ({', '.join(unused)})" if unused else ""))
+        totals['updated'] += counts['updated']
+        totals['unchanged'] += counts['unchanged']
+        totals['unmatched'] += len(unused)
+
+    return totals
 
 def main():
-    """Main function to update all unit files"""
-
-    # Update Flesh Eater Courts
-    fec_dir = UNITS_BASE / "flesh-eater-courts"
-    fec_updated = 0
-    for unit_id, profile in FEC_PROFILES.items():
-        if update_unit_file(fec_dir, unit_id, profile):
-            fec_updated += 1
-    print(f"✅ Flesh Eater Courts: Updated {fec_updated} units")
-
-    # Update Ossiarch Bonereapers
-    obr_dir = UNITS_BASE / "ossiarch-bonereapers"
-    obr_updated = 0
-    for unit_id, profile in OBR_PROFILES.items():
-        if update_unit_file(obr_dir, unit_id, profile):
-            obr_updated += 1
-    print(f"✅ Ossiarch Bonereapers: Updated {obr_updated} units")
-
-    # Update Slaves to Darkness
-    std_dir = UNITS_BASE / "slaves-to-darkness"
-    std_updated = 0
-    for unit_id, profile in STD_PROFILES.items():
-        if update_unit_file(std_dir, unit_id, profile):
-            std_updated += 1
-    print(f"✅ Slaves to Darkness: Updated {std_updated} units")
-
-    # Update Stormcast Eternals
-    sce_dir = UNITS_BASE / "stormcast-eternals"
-    sce_updated = 0
-    for unit_id, profile in SCE_PROFILES.items():
-        if update_unit_file(sce_dir, unit_id, profile):
-            sce_updated += 1
-    print(f"✅ Stormcast Eternals: Updated {sce_updated} units")
-
-    total = fec_updated + obr_updated + std_updated + sce_updated
-    print(f"\n🎉 Total units updated: {total}")
+    parser = argparse.ArgumentParser(
+        description="Upsert battle profile tables into unit JSON files.",
+        epilog="Example: python update_unit_profiles.py --input profiles.csv --dry-run")
+    parser.add_argument('--input', type=Path,
+                        help="JSON or CSV profile table (default: parse the Battle Profile txt files)")
+    parser.add_argument('--faction', action='append',
+                        help="Only update this faction slug (repeatable)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Report changes without writing unit files")
+    args = parser.parse_args()
+
+    if args.input:
+        try:
+            tables = profiles_from_file(args.input)
+        except (OSError, ValueError) as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+    else:
+        factions = [f for f in FACTIONS if not args.faction or f[0] in args.faction]
+        tables = profiles_from_text(factions)
+    if args.faction:
+        tables = {slug: table for slug, table in tables.items() if slug in args.faction}
+
+    totals = apply_profiles(tables, args.dry_run)
+    verb = 'would be updated' if args.dry_run else 'updated'
+    print(f"\n✓ {totals['updated']} unit files {verb}, {totals['unchanged']} unchanged, "
+          f"{totals['unmatched']} rows without a unit file, {totals['ambiguous']} ambiguous")
 
 if __name__ == "__main__":
     main()
@@ -66,7 +66,9 @@ export type UnitKeywords = z.infer<typeof UnitKeywordsSchema>;
 export const BattleProfileSchema = z.object({
   unitSize: z.union([z.number(), z.string()]), // Can be a number or range like "3-6"
   points: z.number(),
-  keywords: z.array(z.string()).optional(),
+  regimentOptions: z.string().optional(), // Heroes only, e.g. "0-1 Royal Attendant, Any Serfs"
+  keywords: z.array(z.string()).optional(), // Relevant keywords (non-hero units)
+  notes: z.string().optional(),
   baseSize: z.string().optional(),
   isManifestation: z.boolean().optional(), // True for Manifestations/Endless Spells
   isFactionTerrain: z.boolean().optional(), // True for Faction Terrain
@@ -96,6 +98,9 @@ export const UnitWarscrollSchema = z.object({
   // Battle profile (points, unit size, etc.)
   battleProfile: BattleProfileSchema.optional(),
 
+  // Keyword -> rules reference id ("20.0", "term:Ward"); added to catalog bundles
+  ruleReferences: z.record(z.string()).optional(),
+
   // Metadata
   sourceFile: z.string(),
   extractedAt: z.string(), // ISO timestamp
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Run the data ingest pipeline incrementally.
+
+Each stage declares the files it reads and writes, per target (a PDF, a
+faction, or the whole catalog). The driver hashes every target's inputs and
+only re-runs the stages - and within them only the factions - whose input
+hash changed since the last successful run, or whose outputs are missing:
+
+    pdf-text       docs/references/**/*.pdf          -> .txt next to each PDF
+    units          faction text files                -> data/units/<faction>/
+                   (opt-in: only with --stage units or --faction, and only
+                   factions that already have a unit directory unless named
+                   with --faction)
+    points         Battle Profile txt + unit files   -> battleProfile, factions.json
+    rules-refs     rules texts + unit files          -> data/rules-references.json
+    bundles        unit files + rules references     -> frontend/public/catalog/
+    catalog-db     unit files + profiles + factions  -> data/catalog.db
+
+Stage scripts are part of their inputs, so a parser change re-runs its stage.
+The units stage merges fresh extractions into hand-curated files, so a plain
+run leaves it alone; units it marks '_needs_manual_review' are left out of the
+rules references, bundles and catalog database until someone checks them.
+Input hashes are recorded after a stage succeeds (stages such as points
+rewrite their own inputs), in .pipeline-state.json at the repo root; file
+hashes are cached there by mtime and size.
+
+Usage:
+    python build_pipeline.py
+    python build_pipeline.py --dry-run
+    python build_pipeline.py --stage points --faction stormcast-eternals
+    python build_pipeline.py --stage units                      # re-extract existing factions
+    python build_pipeline.py --stage units --faction seraphon   # import a new faction
+    python build_pipeline.py --force
+"""
+
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+SCRIPTS_DIR = ROOT_DIR / 'scripts'
+SHARED_DIR = ROOT_DIR / 'packages' / 'shared'
+SHARED_SCRIPTS_DIR = SHARED_DIR / 'scripts'
+sys.path.insert(0, str(SHARED_SCRIPTS_DIR))
+
+from extract_units_from_text import UNITS_DIR, discover_faction_files  # noqa: E402
+from update_unit_points import (  # noqa: E402
+    BATTLE_PROFILES_DIR,
+    FACTIONS,
+    FACTIONS_JSON_PATH,
+    file_sha256,
+    write_json_atomic,
+)
+
+STATE_PATH = ROOT_DIR / '.pipeline-state.json'
+STATE_VERSION = 1
+REFERENCES_DIR = ROOT_DIR / 'docs' / 'references'
+RULES_DIR = REFERENCES_DIR / 'rules'
+RULES_REFERENCES_PATH = SHARED_DIR / 'data' / 'rules-references.json'
+CATALOG_MANIFEST_PATH = SHARED_DIR.parent / 'frontend' / 'public' / 'catalog' / 'manifest.json'
+CATALOG_DB_PATH = SHARED_DIR / 'data' / 'catalog.db'
+
+def script(directory, name):
+    """argv prefix to run a pipeline script with this interpreter."""
+    return [sys.executable, str(directory / name)]
+
+def unit_files(faction_id=None):
+    """Unit JSON files of one faction, or of all factions."""
+    pattern = f'{faction_id}/*.json' if faction_id else '*/*.json'
+    return sorted(UNITS_DIR.glob(pattern))
+
+def pdf_targets():
+    return {str(pdf.relative_to(ROOT_DIR)): pdf for pdf in sorted(REFERENCES_DIR.glob('**/*.pdf'))}
+
+def unit_targets():
+    return discover_faction_files()
+
+def points_targets():
+    return {slug: (BATTLE_PROFILES_DIR / filename, section) for slug, filename, section in FACTIONS}
+
+def catalog_targets():
+    return {'all': None}
+
+# Each stage: targets() -> {target: value}; inputs/outputs(target, value) ->
+# paths; command(targets) -> argv for the stale targets (one run per stage);
+# optional explicit: True if the stage only runs when named with --stage or
+# --faction; optional opt_in(target, value) -> True if the target only runs
+# when named with --faction
+STAGES = [
+    {
+        'name': 'pdf-text',
+        'targets': pdf_targets,
+        'inputs': lambda target, pdf: [pdf, SCRIPTS_DIR / 'extract_pdf_text.py'],
+        'outputs': lambda target, pdf: [pdf.with_suffix('.txt')],
+        'command': lambda targets: script(SCRIPTS_DIR, 'extract_pdf_text.py') + [
+            str(ROOT_DIR / target) for target in targets],
+    },
+    {
+        'name': 'units',
+        'targets': unit_targets,
+        'inputs': lambda faction_id, text_files: list(text_files) + [
+            SCRIPTS_DIR / 'extract_units_from_text.py'],
+        'outputs': lambda faction_id, text_files: [UNITS_DIR / faction_id],
+        # --merge rewrites curated files, so a plain run never extracts
+        'explicit': True,
+        # A faction pack with no unit directory yet is only extracted when it
+        # is named with --faction, so a fresh checkout doesn't import every pack
+        'opt_in': lambda faction_id, text_files: not (UNITS_DIR / faction_id).is_dir(),
+        # extract_units_from_text.py takes one faction per run
+        'command': lambda targets: [
+            script(SCRIPTS_DIR, 'extract_units_from_text.py') + [faction_id, '--merge']
+            for faction_id in targets],
+    },
+    {
+        'name': 'points',
+        'targets': points_targets,
+        'inputs': lambda slug, profile: [profile[0], SHARED_SCRIPTS_DIR / 'update_unit_points.py']
+        + unit_files(slug),
+        'outputs': lambda slug, profile: [FACTIONS_JSON_PATH],
+        'command': lambda targets: script(SHARED_SCRIPTS_DIR, 'update_unit_points.py') + [
+            arg for slug in targets for arg in ('--faction', slug)],
+    },
+    {
+        'name': 'rules-refs',
+        'targets': catalog_targets,
+        'inputs': lambda target, _: sorted(RULES_DIR.glob('*.txt')) + unit_files() + [
+            SCRIPTS_DIR / 'index_rules_text.py', SCRIPTS_DIR / 'build_rules_references.py'],
+        'outputs': lambda target, _: [RULES_REFERENCES_PATH],
+        'command': lambda targets: script(SCRIPTS_DIR, 'build_rules_references.py'),
+    },
+    {
+        'name': 'bundles',
+        'targets': catalog_targets,
+        'inputs': lambda target, _: unit_files() + [
+            RULES_REFERENCES_PATH, SHARED_SCRIPTS_DIR / 'build_catalog_bundles.py'],
+        'outputs': lambda target, _: [CATALOG_MANIFEST_PATH],
+        'command': lambda targets: script(SHARED_SCRIPTS_DIR, 'build_catalog_bundles.py'),
+    },
+    {
+        'name': 'catalog-db',
+        'targets': catalog_targets,
+        'inputs': lambda target, _: unit_files() + sorted(BATTLE_PROFILES_DIR.glob('Battle Profile*.txt'))
+        + [FACTIONS_JSON_PATH, SHARED_SCRIPTS_DIR / 'build_catalog_db.py',
+           SHARED_SCRIPTS_DIR / 'update_unit_points.py'],
+        'outputs': lambda target, _: [CATALOG_DB_PATH],
+        'command': lambda targets: script(SHARED_SCRIPTS_DIR, 'build_catalog_db.py'),
+    },
+]
+
+def load_state():
+    """Load the recorded file and stage hashes, or an empty state."""
+    if STATE_PATH.exists():
+        with open(STATE_PATH, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') == STATE_VERSION:
+            return state
+    return {'version': STATE_VERSION, 'files': {}, 'stages': {}}
+
+def save_state(state):
+    """Atomically write the pipeline state."""
+    write_json_atomic(STATE_PATH, state)
+
+def file_hash(path, state):
+    """SHA-256 of a file, reusing the cached digest while its mtime and size match."""
+    key = str(path.relative_to(ROOT_DIR))
+    stat = path.stat()
+    cached = state['files'].get(key)
+    if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        return cached[2]
+
+    digest = file_sha256(path)
+    state['files'][key] = [stat.st_mtime, stat.st_size, digest]
+    return digest
+
+def inputs_hash(paths, state):
+    """Hash a target's inputs: each path with its content hash, or 'missing'."""
+    digest = hashlib.sha256()
+    for path in sorted(set(paths)):
+        content = file_hash(path, state) if path.is_file() else 'missing'
+        digest.update(f"{path.relative_to(ROOT_DIR)}\0{content}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def stale_targets(stage, state, only=None, force=False):
+    """Return the stage's targets whose inputs changed or outputs are missing.
+
+    Args:
+        stage: Entry from STAGES
+        state: Pipeline state
+        only: Optional set of targets (e.g. faction ids) to limit the stage to;
+              opt-in targets are skipped unless they are in it
+        force: Treat every target as stale
+    """
+    stale = {}
+    opt_in = stage.get('opt_in', lambda target, value: False)
+    for target, value in stage['targets']().items():
+        if only and target not in only:
+            continue
+        if not only and opt_in(target, value):
+            continue
+        key = f"{stage['name']}:{target}"
+        current = inputs_hash(stage['inputs'](target, value), state)
+        outputs_present = all(path.exists() for path in stage['outputs'](target, value))
+        if force or not outputs_present or state['stages'].get(key) != current:
+            stale[target] = value
+    return stale
+
+def run_stage(stage, targets, state):
+    """Run a stage for its stale targets and record their new input hashes.
+
+    Returns:
+        True on success
+    """
+    commands = stage['command'](list(targets))
+    if commands and isinstance(commands[0], str):
+        commands = [commands]
+    for command in commands:
+        result = subprocess.run(command, cwd=ROOT_DIR)
+        if result.returncode != 0:
+            print(f"  ✗ {stage['name']}: {' '.join(Path(arg).name for arg in command[1:3])} "
+                  f"exited with {result.returncode}")
+            return False
+
+    # Hash after running: stages like points rewrite their own inputs
+    for target, value in targets.items():
+        state['stages'][f"{stage['name']}:{target}"] = inputs_hash(stage['inputs'](target, value), state)
+    return True
+
+def main():
+    stage_names = [stage['name'] for stage in STAGES]
+    parser = argparse.ArgumentParser(
+        description="Re-run only the ingest stages and factions whose inputs changed.",
+        epilog="Example: python build_pipeline.py --stage points --faction stormcast-eternals")
+    parser.add_argument('--stage', action='append', choices=stage_names,
+                        help="Only run this stage (repeatable; default: all, in order)")
+    parser.add_argument('--faction', action='append',
+                        help="Limit per-faction stages to this faction id (repeatable); "
+                             "also runs the units stage for it, importing a faction with "
+                             "no unit directory yet")
+    parser.add_argument('--force', action='store_true',
+                        help="Re-run the selected stages even if their inputs are unchanged")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="List what would run without running it")
+    args = parser.parse_args()
+
+    state = load_state()
+    per_faction = {'units', 'points'}
+    start = time.perf_counter()
+    ran = 0
+
+    try:
+        for stage in STAGES:
+            if args.stage and stage['name'] not in args.stage:
+                continue
+            if stage.get('explicit') and not args.stage and not args.faction:
+                print(f"- {stage['name']}: skipped (run with --stage {stage['name']} or --faction)")
+                continue
+            only = set(args.faction) if args.faction and stage['name'] in per_faction else None
+            targets = stale_targets(stage, state, only, args.force)
+            if not targets:
+                print(f"✓ {stage['name']}: up to date")
+                continue
+
+            names = ', '.join(targets) if len(targets) <= 5 else f"{len(targets)} targets"
+            if args.dry_run:
+                print(f"• {stage['name']}: would run for {names}")
+                continue
+
+            print(f"\n▶ {stage['name']}: {names}")
+            if not run_stage(stage, targets, state):
+                sys.exit(1)
+            ran += 1
+    finally:
+        # Keep the file hash cache and finished stages even if a later one fails
+        if not args.dry_run:
+            save_state(state)
+
+    if not args.dry_run:
+        print(f"\n✓ {ran} stage(s) run in {time.perf_counter() - start:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Precompute which rules sections define the keywords used by each unit.
+
+Unit keywords ("Ward (5+)", "Fly"), weapon abilities ("Crit (Auto-wound)",
+"Anti-Infantry (+1 Rend)"), ability keywords ("Rampage", "Spell") and rules
+terms named in ability effects ("Strike-first") are reduced to a base term and
+resolved once against the rules full-text index (index_rules_text.py):
+
+- terms in RULE_SECTIONS point at the numbered section that defines them, e.g.
+  Crit -> "20.0 WEAPON ABILITIES", located by its heading in the index
+- any other term falls back to the pages where the rules text mentions it
+
+The result, packages/shared/data/rules-references.json, holds the reference
+table plus a keyword -> reference map for every unit, so
+build_catalog_bundles.py can attach definitions to units with plain lookups.
+
+Usage:
+    python build_rules_references.py
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+from index_rules_text import load_rules_index, search_rules
+from update_unit_points import write_json_atomic
+
+ROOT_DIR = Path(__file__).parent.parent
+UNITS_DIR = ROOT_DIR / 'packages' / 'shared' / 'data' / 'units'
+REFERENCES_PATH = ROOT_DIR / 'packages' / 'shared' / 'data' / 'rules-references.json'
+REFERENCES_VERSION = 2
+
+# Base term -> numbered heading of the section that defines it
+RULE_SECTIONS = {
+    'Anti-X': '20.0 WEAPON ABILITIES',
+    'Charge': '20.0 WEAPON ABILITIES',
+    'Companion': '20.0 WEAPON ABILITIES',
+    'Crit': '20.0 WEAPON ABILITIES',
+    'Shoot in Combat': '20.0 WEAPON ABILITIES',
+    'Strike-first': '19.0 STRIKE-FIRST AND STRIKE-LAST',
+    'Strike-last': '19.0 STRIKE-FIRST AND STRIKE-LAST',
+    'Fly': '15.4 FLYING',
+    'Spell': '2.0 SPELLS',
+    'Wizard': '2.0 SPELLS',
+    'Prayer': '3.0 PRAYERS',
+    'Priest': '3.0 PRAYERS',
+    'Manifestation': '7.0 MANIFESTATIONS',
+    'Endless Spell': '7.0 MANIFESTATIONS',
+    'Banishment': '7.2 BANISHING MANIFESTATIONS',
+    'Faction Terrain': '1.5 FACTION TERRAIN',
+}
+# Rules terms worth linking when an ability's effect text names them
+EFFECT_TERMS = ('Strike-first', 'Strike-last', 'Ward', 'Fly', 'Companion', 'Shoot in Combat')
+EFFECT_TERM_PATTERN = re.compile(r'\b(' + '|'.join(re.escape(term) for term in EFFECT_TERMS) + r')\b')
+
+# 'Ward (5+)' -> 'Ward', 'Anti-Infantry (+1 Rend)' -> 'Anti-X'
+PARAMETER_PATTERN = re.compile(r'\s*\([^)]*\)$')
+# Mention-only references keep a few pages
+MAX_MENTION_PAGES = 5
+
+def base_term(keyword):
+    """Reduce a keyword or weapon ability to the rules term it is an instance of."""
+    term = PARAMETER_PATTERN.sub('', keyword.strip())
+    if term.startswith('Anti-'):
+        return 'Anti-X'
+    return term
+
+def split_weapon_abilities(ability):
+    """'Crit (2 Hits), Companion' -> ['Crit (2 Hits)', 'Companion']."""
+    if not ability or ability == '-':
+        return []
+    return [part.strip() for part in re.split(r',\s*(?![^()]*\))', ability) if part.strip()]
+
+def unit_rule_keywords(unit_data):
+    """Every keyword on a unit that could link to a rules definition."""
+    keywords = list(unit_data.get('keywords', {}).get('unit', []))
+    for weapon in (unit_data.get('meleeWeapons') or []) + (unit_data.get('rangedWeapons') or []):
+        keywords.extend(split_weapon_abilities(weapon.get('ability')))
+    for ability in unit_data.get('abilities', []):
+        keywords.extend(ability.get('keywords', []))
+        keywords.extend(EFFECT_TERM_PATTERN.findall(ability.get('effect', '')))
+    return list(dict.fromkeys(keywords))
+
+def find_heading(index, heading):
+    """Locate a numbered heading in the rules index.
+
+    Returns:
+        (file name, [pages]) for the first file whose pages carry the heading,
+        or (None, [])
+    """
+    for name, entry in index['files'].items():
+        pages = [page['page'] for page in entry.get('pages', [])
+                 if any(title == heading for _, title in page['headings'])]
+        if pages:
+            return name, pages
+    return None, []
+
+def resolve_term(index, term):
+    """Build the reference for one base term, or None if the rules never mention it."""
+    heading = RULE_SECTIONS.get(term)
+    if heading:
+        name, pages = find_heading(index, heading)
+        if name:
+            number, title = heading.split(' ', 1)
+            return {'match': 'definition', 'section': number, 'title': title,
+                    'file': name, 'pages': pages}
+        print(f"  Warning: heading '{heading}' for {term} not found in the rules index")
+
+    hits = search_rules(index, 'anti' if term == 'Anti-X' else term, limit=1000, context=0)
+    if not hits:
+        return None
+    pages = list(dict.fromkeys(hit['page'] for hit in hits if hit['file'] == hits[0]['file']))
+    return {'match': 'mention', 'section': None, 'title': term,
+            'file': hits[0]['file'], 'pages': pages[:MAX_MENTION_PAGES]}
+
+def reference_key(reference, term):
+    """Id a reference by its rules file and section; section numbers restart in each file."""
+    if reference['section'] is None:
+        return f"term:{term}"
+    return f"{Path(reference['file']).stem}#{reference['section']}"
+
+def build_rules_references(index, units_dir=UNITS_DIR):
+    """Resolve every unit's rule keywords.
+
+    Returns:
+        Dict with 'references' (reference id -> reference; 'Core Rules#20.0'
+        for definitions, 'term:Ward' for mentions), 'terms' (base term ->
+        reference id) and 'units' ('<faction>/<unit id>' -> keyword -> reference id)
+    """
+    result = {'version': REFERENCES_VERSION, 'references': {}, 'terms': {}, 'units': {}}
+    unresolved = set()
+
+    for json_file in sorted(units_dir.glob('*/*.json')):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            unit_data = json.load(f)
+        # Left out of the catalog until checked (see build_catalog_bundles.py)
+        if unit_data.get('_needs_manual_review'):
+            continue
+
+        links = {}
+        for keyword in unit_rule_keywords(unit_data):
+            term = base_term(keyword)
+            if term not in result['terms'] and term not in unresolved:
+                reference = resolve_term(index, term)
+                if reference is None:
+                    unresolved.add(term)
+                    continue
+                reference_id = reference_key(reference, term)
+                result['references'].setdefault(reference_id, reference)
+                result['terms'][term] = reference_id
+            if term in result['terms']:
+                links[keyword] = result['terms'][term]
+
+        if links:
+            faction_id = unit_data.get('factionId', json_file.parent.name)
+            result['units'][f"{faction_id}/{unit_data.get('id', json_file.stem)}"] = links
+
+    result['terms'] = dict(sorted(result['terms'].items()))
+    result['references'] = dict(sorted(result['references'].items()))
+    if unresolved:
+        print(f"  No rules text for: {', '.join(sorted(unresolved))}")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Link unit keywords and abilities to the rules sections that define them.")
+    parser.add_argument('--output', type=Path, default=REFERENCES_PATH,
+                        help=f"JSON file to write (default: {REFERENCES_PATH})")
+    args = parser.parse_args()
+
+    index = load_rules_index()
+    result = build_rules_references(index)
+
+    existing = None
+    if args.output.exists():
+        with open(args.output, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+    if existing == result:
+        print(f"✓ {args.output.name} is up to date")
+        return
+
+    write_json_atomic(args.output, result)
+
+    definitions = sum(1 for ref in result['references'].values() if ref['match'] == 'definition')
+    print(f"✓ {len(result['terms'])} terms ({definitions} defined sections), "
+          f"{len(result['units'])} units -> {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -1,45 +1,563 @@
 #!/usr/bin/env python3
 """
-Extract text from a single PDF file.
-Usage: python extract_pdf_text.py <path_to_pdf>
+Extract text from PDF files.
+Usage: python extract_pdf_text.py <pdf|directory|glob> [...] [--workers N] [--force]
+                                  [--pages 8-14] [--incremental] [--layout columns]
+                                  [--format jsonl]
+
+Directories and globs are expanded to every PDF they contain. A SHA-256 of each
+PDF is recorded in a manifest next to its .txt, and PDFs whose hash is unchanged
+are skipped unless --force is given.
+
+The manifest also records a hash of each page's content stream. With
+--incremental only pages whose hash changed are re-extracted, and with --pages
+only the given pages are; either way the new text is spliced into the existing
+.txt by its '--- Page N ---' markers.
+
+With --layout columns, pages are split into column regions using word
+coordinates, so two-column warscroll abilities come out one column at a time
+rather than interleaved line by line.
+
+With --format jsonl, a .jsonl file is written instead of a .txt, holding one
+record per text line with its page number, bounding box and dominant font, e.g.
+{"page": 3, "text": "MELEE WEAPONS Atk Hit Wnd Rnd Dmg", "bbox": [...],
+ "font": "ArnoPro-BoldCaption", "size": 8.0, "bold": true}
 """
 
+import argparse
+import glob
+import hashlib
+import json
+import os
 import pdfplumber
+import re
 import sys
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from pdfminer.pdftypes import resolve1
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'packages' / 'shared' / 'scripts'))
+
+from update_unit_points import file_sha256, write_json_atomic  # noqa: E402
+
+MANIFEST_FILENAME = '.pdf_text_manifest.json'
+
+OUTPUT_SUFFIXES = {
+    'text': '.txt',
+    'jsonl': '.jsonl',
+}
+
+PAGE_MARKER_PATTERN = re.compile(r'^--- Page (\d+) ---\n', re.MULTILINE)
+
+def format_page(page_number, page_text):
+    """Format a page's text as a '--- Page N ---' block."""
+    return f"--- Page {page_number} ---\n{page_text}\n"
+
+def parse_page_ranges(spec):
+    """Parse a page spec like '8-14' or '1,3,8-14' into a set of page numbers."""
+    pages = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            pages.update(range(int(start), int(end) + 1))
+        else:
+            pages.add(int(part))
+    return pages
+
+def read_page_blocks(txt_path, output_format='text'):
+    """Read an extracted .txt back into {page_number: page_text}.
+
+    This is the inverse of joining format_page() blocks with newlines. For
+    .jsonl output, each page's text is its records joined by newlines.
+    """
+    with open(txt_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    if output_format == 'jsonl':
+        blocks = {}
+        for line in content.splitlines():
+            if line:
+                page_number = json.loads(line)['page']
+                blocks[page_number] = f"{blocks[page_number]}\n{line}" if page_number in blocks else line
+        return blocks
+
+    markers = list(PAGE_MARKER_PATTERN.finditer(content))
+    blocks = {}
+    for n, marker in enumerate(markers):
+        if n + 1 < len(markers):
+            # Trailing "\n" of the block plus the "\n" joining it to the next
+            page_text = content[marker.end():markers[n + 1].start()][:-2]
+        else:
+            page_text = content[marker.end():][:-1]
+        blocks[int(marker.group(1))] = page_text
+    return blocks
+
+def page_content_hash(page):
+    """Hash a page's raw content streams (and media box) without laying it out."""
+    digest = hashlib.sha256(repr(page.mediabox).encode())
+    for stream in page.page_obj.contents:
+        digest.update(resolve1(stream).get_data())
+    return digest.hexdigest()
+
+def group_lines(words, tolerance=3):
+    """Group words into lines by their top coordinate, top to bottom."""
+    lines = []
+    for word in sorted(words, key=lambda w: (w['top'], w['x0'])):
+        if lines and abs(word['top'] - lines[-1][0]['top']) <= tolerance:
+            lines[-1].append(word)
+        else:
+            lines.append([word])
+    return lines
+
+def crosses(line, x, margin=4):
+    """Whether any word in a line comes within `margin` points of x.
+
+    The margin is wider than a normal word space, so a line only counts as
+    split at x if it has a real column gap there.
+    """
+    return any(w['x0'] < x + margin and w['x1'] > x - margin for w in line)
+
+def find_gutter(page, lines, min_lines=3):
+    """Find the x position of the gap between two text columns, if any.
+
+    Picks the x in the middle of the page crossed by the fewest lines (nearest
+    the centre on ties), and requires at least `min_lines` lines with words on
+    both sides of it. Returns None for single-column pages.
+    """
+    left, right = int(page.bbox[0] + page.width * 0.3), int(page.bbox[0] + page.width * 0.7)
+    centre = page.bbox[0] + page.width / 2
+
+    best = None
+    for x in range(left, right + 1):
+        score = (sum(crosses(line, x) for line in lines), abs(x - centre))
+        if best is None or score < best[0]:
+            best = (score, x)
+
+    if best is None:
+        return None
+
+    gutter = best[1]
+    two_sided = sum(
+        1 for line in lines
+        if not crosses(line, gutter)
+        and any(w['x1'] <= gutter for w in line)
+        and any(w['x0'] >= gutter for w in line)
+    )
+    return gutter if two_sided >= min_lines else None
+
+def column_regions(page, min_band_lines=3):
+    """Split a page into bounding boxes in reading order.
+
+    Runs of at least `min_band_lines` lines that do not cross the column gutter
+    become a left and a right region (left first); everything else, such as
+    characteristic headers and weapon tables, stays full width.
+    """
+    x0, top, x1, bottom = page.bbox
+    lines = group_lines(page.extract_words())
+    gutter = find_gutter(page, lines, min_band_lines) if lines else None
+    if gutter is None:
+        return [page.bbox]
+
+    # Consecutive lines with the same split/full-width classification
+    bands = []
+    for line in lines:
+        split = not crosses(line, gutter)
+        if bands and bands[-1][0] == split:
+            bands[-1][1].append(line)
+        else:
+            bands.append((split, [line]))
+
+    # Short split runs are table rows that happen to have a gap; merge them
+    merged = []
+    for split, band_lines in bands:
+        split = split and len(band_lines) >= min_band_lines
+        if merged and merged[-1][0] == split:
+            merged[-1][1].extend(band_lines)
+        else:
+            merged.append((split, band_lines))
+
+    regions = []
+    for n, (split, band_lines) in enumerate(merged):
+        # Band edges sit midway between the last and first lines of neighbours
+        band_top = top if n == 0 else (
+            max(w['bottom'] for w in merged[n - 1][1][-1]) + min(w['top'] for w in band_lines[0])
+        ) / 2
+        band_bottom = bottom if n == len(merged) - 1 else (
+            max(w['bottom'] for w in band_lines[-1]) + min(w['top'] for w in merged[n + 1][1][0])
+        ) / 2
+
+        if split:
+            regions.append((x0, band_top, gutter, band_bottom))
+            regions.append((gutter, band_top, x1, band_bottom))
+        else:
+            regions.append((x0, band_top, x1, band_bottom))
+
+    return regions
+
+def extract_columns_text(page):
+    """Extract a page's text with two-column regions emitted in reading order."""
+    texts = []
+    for bbox in column_regions(page):
+        region_text = page.within_bbox(bbox).extract_text()
+        if region_text:
+            texts.append(region_text)
+    return '\n'.join(texts)
+
+def line_record(page_number, line):
+    """Build a JSON-lines record for a pdfplumber text line."""
+    fontname, size = Counter(
+        (char['fontname'], round(char['size'], 1)) for char in line['chars']
+    ).most_common(1)[0][0]
+    fontname = fontname.split('+', 1)[-1]  # drop the subset tag, e.g. "LZBPQG+"
+
+    return {
+        'page': page_number,
+        'text': line['text'],
+        'bbox': [round(line[key], 2) for key in ('x0', 'top', 'x1', 'bottom')],
+        'font': fontname,
+        'size': size,
+        'bold': 'bold' in fontname.lower()
+    }
+
+def extract_jsonl(page, layout='plain'):
+    """Extract a page's text lines as JSON-lines records (one per line)."""
+    regions = column_regions(page) if layout == 'columns' else [page.bbox]
+    records = [
+        json.dumps(line_record(page.page_number, line), ensure_ascii=False)
+        for bbox in regions
+        for line in page.within_bbox(bbox).extract_text_lines(return_chars=True)
+        if line['chars']
+    ]
+    return '\n'.join(records)
+
+def extract_page(page, layout='plain', output_format='text'):
+    """Extract a page's text, then release its cached layout objects.
+
+    Args:
+        page: pdfplumber page
+        layout: 'plain' for pdfplumber's default text flow, or 'columns' to
+                split two-column regions (e.g. warscroll abilities) so each
+                column is emitted whole instead of interleaved line by line
+        output_format: 'text', or 'jsonl' for one JSON record per line
+    """
+    try:
+        if output_format == 'jsonl':
+            return extract_jsonl(page, layout)
+        if layout == 'columns':
+            return extract_columns_text(page)
+        return page.extract_text()
+    finally:
+        page.close()
+
+def extract_pages(pdf_path, page_numbers, shard_path, layout='plain', output_format='text'):
+    """Extract the given (1-based) pages of a PDF into a shard file.
 
-def extract_pdf_text(pdf_path):
-    """Extract text from a PDF file and save to a .txt file."""
+    Each call opens its own pdfplumber handle so it can run in a worker process.
+    Every non-empty page is written to shard_path as a JSON line
+    [page_number, page_text] as soon as it is extracted, so a shard is never
+    held in memory. Returns shard_path.
+    """
+    with pdfplumber.open(pdf_path) as pdf, open(shard_path, 'w', encoding='utf-8') as f:
+        for i in page_numbers:
+            page_text = extract_page(pdf.pages[i - 1], layout, output_format)
+            if page_text:
+                f.write(json.dumps([i, page_text], ensure_ascii=False) + '\n')
+    return shard_path
+
+def shard_pages(page_numbers, workers):
+    """Split a sorted list of page numbers into at most `workers` contiguous runs."""
+    shard_size = -(-len(page_numbers) // workers)  # ceiling division
+    return [
+        page_numbers[start:start + shard_size]
+        for start in range(0, len(page_numbers), shard_size)
+    ]
+
+def iter_pages(pdf, page_numbers, layout='plain', output_format='text'):
+    """Yield (page_number, page_text) for each non-empty page, one at a time."""
+    for n, i in enumerate(page_numbers, 1):
+        print(f"  Extracting page {n}/{len(page_numbers)}...", end='\r')
+        page_text = extract_page(pdf.pages[i - 1], layout, output_format)
+        if page_text:
+            yield i, page_text
+
+def iter_pages_parallel(pdf_path, page_numbers, workers, layout='plain', output_format='text'):
+    """Yield (page_number, page_text) in page order from a process pool.
+
+    Workers stream their pages to per-shard temp files; pages are read back
+    one at a time, so memory use stays flat as with a sequential run.
+    """
+    shards = shard_pages(page_numbers, workers)
+    print(f"  Extracting {len(page_numbers)} pages across {len(shards)} workers...")
+
+    with tempfile.TemporaryDirectory(prefix='pdf-text-shards-') as shard_dir, \
+            ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        futures = [
+            pool.submit(extract_pages, pdf_path, shard, Path(shard_dir) / f"{n}.jsonl",
+                        layout, output_format)
+            for n, shard in enumerate(shards)
+        ]
+        # Futures are in shard order, so pages come back in order
+        for future in futures:
+            with open(future.result(), 'r', encoding='utf-8') as f:
+                for line in f:
+                    page_number, page_text = json.loads(line)
+                    yield page_number, page_text
+
+def merge_pages(extracted, existing, selected):
+    """Splice freshly extracted pages into existing page blocks, in page order.
+
+    Args:
+        extracted: (page_number, page_text) iterator over the selected pages
+        existing: {page_number: page_text} from the current .txt
+        selected: Page numbers that were re-extracted (and replace `existing`)
+    """
+    extracted = iter(extracted)
+    pending = next(extracted, None)
+
+    for i in sorted(set(existing) | selected):
+        if i not in selected:
+            yield i, existing[i]
+        elif pending and pending[0] == i:
+            yield pending
+            pending = next(extracted, None)
+
+def write_pages(txt_path, pages, output_format='text'):
+    """Stream '--- Page N ---' blocks (or JSON lines) to txt_path as they are produced.
+
+    Blocks are written to a temp file in the same directory and renamed over
+    txt_path only once every page has been extracted, so a failure part-way
+    through leaves any previous .txt untouched.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=txt_path.parent, prefix=f".{txt_path.name}.", suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for n, (i, page_text) in enumerate(pages):
+                if output_format == 'jsonl':
+                    f.write(f"{page_text}\n")
+                else:
+                    if n:
+                        f.write('\n')
+                    f.write(format_page(i, page_text))
+                f.flush()
+        os.chmod(tmp_path, 0o644)  # mkstemp creates files as 0600
+        os.replace(tmp_path, txt_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def extract_pdf_text(pdf_path, workers=1, pages=None, page_hashes=None, incremental=False,
+                     layout='plain', output_format='text'):
+    """Extract text from a PDF file and save to a .txt (or .jsonl) file.
+
+    Pages are written out as soon as they are extracted, so memory use stays
+    flat regardless of page count.
+
+    Args:
+        pdf_path: Path to the PDF
+        workers: Number of worker processes. With more than one, page ranges are
+                 sharded across a process pool and reassembled in page order, so
+                 the output is identical to a sequential run.
+        pages: If provided, only re-extract these page numbers and keep the rest
+               of the existing .txt
+        page_hashes: If provided, a {page_number: content_hash} dict (string keys,
+                     as stored in the manifest). It is updated in place with the
+                     hashes of every page that gets extracted.
+        incremental: Only re-extract pages whose hash differs from page_hashes
+        layout: 'plain' or 'columns' (see extract_page)
+        output_format: 'text' for a .txt file or 'jsonl' for a .jsonl file
+    """
     pdf_path = Path(pdf_path)
-    txt_path = pdf_path.with_suffix('.txt')
+    txt_path = pdf_path.with_suffix(OUTPUT_SUFFIXES[output_format])
 
     print(f"Processing: {pdf_path.name}")
 
     try:
         with pdfplumber.open(pdf_path) as pdf:
-            text_content = []
+            page_count = len(pdf.pages)
+            all_pages = set(range(1, page_count + 1))
+            selected = all_pages if pages is None else pages & all_pages
+
+            current_hashes = {}
+            if page_hashes is not None:
+                current_hashes = {
+                    str(i): page_content_hash(page)
+                    for i, page in enumerate(pdf.pages, 1)
+                }
+                if incremental:
+                    selected = {
+                        i for i in selected
+                        if page_hashes.get(str(i)) != current_hashes[str(i)]
+                    }
 
-            for i, page in enumerate(pdf.pages, 1):
-                print(f"  Extracting page {i}/{len(pdf.pages)}...", end='\r')
-                page_text = page.extract_text()
-                if page_text:
-                    text_content.append(f"--- Page {i} ---\n{page_text}\n")
+            existing = {}
+            if selected != all_pages:
+                if txt_path.exists():
+                    existing = {
+                        i: text for i, text in read_page_blocks(txt_path, output_format).items()
+                        if i <= page_count
+                    }
+                else:
+                    print(f"  No existing {txt_path.name}, extracting all pages")
+                    selected = all_pages
 
-            # Write extracted text to file
-            with open(txt_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(text_content))
+            if not selected:
+                print(f"  ✓ All {page_count} pages unchanged")
+                return True
 
-            print(f"  ✓ Extracted {len(pdf.pages)} pages to {txt_path.name}")
-            return True
+            page_numbers = sorted(selected)
+            if workers > 1 and len(page_numbers) > 1:
+                extracted = iter_pages_parallel(
+                    pdf_path, page_numbers, workers, layout, output_format
+                )
+            else:
+                extracted = iter_pages(pdf, page_numbers, layout, output_format)
+
+            write_pages(txt_path, merge_pages(extracted, existing, selected), output_format)
+
+        if page_hashes is not None:
+            page_hashes.update((str(i), current_hashes[str(i)]) for i in page_numbers)
+
+        print(f"  ✓ Extracted {len(page_numbers)}/{page_count} pages to {txt_path.name}")
+        return True
 
     except Exception as e:
         print(f"  ✗ Error: {e}")
         return False
 
-if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("Usage: python extract_pdf_text.py <path_to_pdf>")
+def find_pdfs(inputs):
+    """Expand files, directories (recursively) and glob patterns into PDF paths."""
+    pdf_paths = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            matches = path.rglob('*.pdf')
+        elif glob.has_magic(item):
+            matches = (Path(p) for p in glob.glob(item, recursive=True))
+        else:
+            matches = [path]
+
+        for match in sorted(matches):
+            if match.suffix.lower() == '.pdf' and match not in pdf_paths:
+                pdf_paths.append(match)
+
+    return pdf_paths
+
+def load_manifest(directory):
+    """Load the PDF hash manifest for a directory ({} if there is none)."""
+    manifest_path = directory / MANIFEST_FILENAME
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_manifest(directory, manifest):
+    """Write the PDF hash manifest for a directory."""
+    write_json_atomic(directory / MANIFEST_FILENAME, dict(sorted(manifest.items())))
+
+def extract_batch(pdf_paths, workers=1, force=False, pages=None, incremental=False,
+                  layout='plain', output_format='text'):
+    """Extract every PDF whose content hash differs from its manifest entry.
+
+    Manifest entries are keyed by output file name, so the .txt and .jsonl
+    outputs of the same PDF are tracked independently.
+
+    When `pages` is given the listed pages are always re-extracted, but the
+    whole-file hash is left alone since the rest of the .txt was not refreshed.
+    A PDF last extracted with a different layout is always fully re-extracted,
+    ignoring `pages` and `incremental`.
+
+    Returns True if every PDF was either up to date or extracted successfully.
+    """
+    extracted, skipped, failed = 0, 0, 0
+
+    by_directory = {}
+    for pdf_path in pdf_paths:
+        by_directory.setdefault(pdf_path.parent, []).append(pdf_path)
+
+    for directory, paths in by_directory.items():
+        manifest = load_manifest(directory)
+        changed = False
+
+        for pdf_path in paths:
+            output_path = pdf_path.with_suffix(OUTPUT_SUFFIXES[output_format])
+            sha256 = file_sha256(pdf_path)
+            entry = manifest.get(output_path.name, {})
+            # An existing output without a manifest entry is assumed plain
+            file_pages, file_incremental = pages, incremental and not force
+            previous_layout = entry.get('layout', 'plain')
+            if output_path.exists() and previous_layout != layout:
+                # Splicing pages of one layout into the other would mix them
+                print(f"Layout of {pdf_path.name} changed ({previous_layout} -> {layout}), "
+                      f"extracting all pages")
+                entry = {}
+                file_pages, file_incremental = None, False
+
+            if (not force and file_pages is None and entry.get('sha256') == sha256
+                    and output_path.exists()):
+                print(f"Skipping: {pdf_path.name} (unchanged)")
+                skipped += 1
+                continue
+
+            page_hashes = dict(entry.get('pages', {}))
+            if extract_pdf_text(pdf_path, workers=workers, pages=file_pages,
+                                page_hashes=page_hashes,
+                                incremental=file_incremental,
+                                layout=layout, output_format=output_format):
+                manifest[output_path.name] = {
+                    'pdf': pdf_path.name,
+                    'sha256': sha256 if file_pages is None else entry.get('sha256'),
+                    'layout': layout,
+                    'pages': page_hashes
+                }
+                changed = True
+                extracted += 1
+            else:
+                failed += 1
+
+        if changed:
+            save_manifest(directory, manifest)
+
+    print(f"\nExtracted {extracted}, skipped {skipped} unchanged, {failed} failed")
+    return failed == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract text from PDF files.")
+    parser.add_argument('inputs', nargs='+',
+                        help="PDF files, directories or glob patterns")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of worker processes (0 = one per CPU core)")
+    parser.add_argument('--force', action='store_true',
+                        help="Re-extract even if the PDF hash is unchanged")
+    parser.add_argument('--pages', type=parse_page_ranges,
+                        help="Only re-extract these pages, e.g. '8-14' or '1,3,8-14'")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only re-extract pages whose content hash changed")
+    parser.add_argument('--layout', choices=['plain', 'columns'], default='plain',
+                        help="'columns' emits two-column regions (e.g. warscroll "
+                             "abilities) in reading order instead of interleaved")
+    parser.add_argument('--format', dest='output_format', choices=sorted(OUTPUT_SUFFIXES),
+                        default='text',
+                        help="'jsonl' writes one record per line with page, bbox and font")
+    args = parser.parse_args()
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    pdf_paths = find_pdfs(args.inputs)
+    if not pdf_paths:
+        print("No PDF files found")
         sys.exit(1)
 
-    pdf_file = sys.argv[1]
-    extract_pdf_text(pdf_file)
+    success = extract_batch(pdf_paths, workers=workers, force=args.force,
+                            pages=args.pages, incremental=args.incremental,
+                            layout=args.layout, output_format=args.output_format)
+    sys.exit(0 if success else 1)
+
+if __name__ == '__main__':
+    main()
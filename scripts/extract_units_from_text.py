@@ -1,15 +1,163 @@
 #!/usr/bin/env python3
 """
 Extract unit warscroll data from faction pack text files and generate JSON files.
-This is a simplified extraction that captures basic unit information.
+
+Each warscroll is parsed in a single pass by a small state machine:
+
+    HEADER -> RANGED/MELEE WEAPONS -> ABILITIES -> KEYWORDS
+
+producing the UnitWarscroll shape described in docs/UNIT_DATA_EXTRACTION_STRATEGY.md.
+Ability text parses best from text extracted with
+`extract_pdf_text.py --layout columns`, where the two ability columns are not
+interleaved. Units that fail validation are marked with '_needs_manual_review'.
+
+Usage:
+    python extract_units_from_text.py <faction-id>
+    python extract_units_from_text.py <faction-id> --unit <unit-id-or-name>
+    python extract_units_from_text.py --all [--workers N]
+
+Add --merge to update existing unit files without overwriting hand-curated
+fields (see merge_unit).
+
+    python extract_units_from_text.py --check-fixtures
+
+checks the header parser against the snippets in fixtures/warscroll-headers.json.
+
+Not supported yet: the Ogor Mawtribes and Hedonites of Slaanesh faction packs
+split their characteristic labels across lines ('MOV E', 'S AV E', 'N T ROL')
+and print weapon tables column by column. parse_split_header() recovers the
+name and characteristics, but their weapons are not parsed, so every unit from
+those packs is marked '_needs_manual_review'.
 """
 
+import argparse
+import hashlib
 import json
+import mmap
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
+ROOT_DIR = Path(__file__).parent.parent
+DOCS_PATH = ROOT_DIR / 'docs' / 'references' / 'factions'
+UNITS_DIR = ROOT_DIR / 'packages' / 'shared' / 'data' / 'units'
+sys.path.insert(0, str(ROOT_DIR / 'packages' / 'shared' / 'scripts'))
+
+from update_unit_points import file_sha256, write_json_atomic, write_unit_json  # noqa: E402
+
+# Warscroll offset index cached next to each text file as '.<stem>.warscrolls.json'.
+# Bump the version when parsing changes what the index records.
+INDEX_SUFFIX = '.warscrolls.json'
+INDEX_VERSION = 1
+
+HEADER_FIXTURES_PATH = Path(__file__).parent / 'fixtures' / 'warscroll-headers.json'
+
+# Fields that change on every run and are ignored when deciding whether to rewrite
+VOLATILE_FIELDS = {'extractedAt'}
+# Bookkeeping fields that --merge always takes from the extraction, never curates
+METADATA_FIELDS = {'id', 'factionId', 'sourceFile', 'extractedAt',
+                   '_needs_manual_review', '_review_notes', '_provenance'}
+# The fields each kind of review note is about, so --merge only keeps notes for
+# fields the file takes from the extraction. Checked in order; a note that
+# matches none is about the whole unit.
+REVIEW_NOTE_FIELDS = [
+    (re.compile(r'weapon|out of range on'), {'rangedWeapons', 'meleeWeapons'}),
+    (re.compile(r'abilit'), {'abilities'}),
+    (re.compile(r'missing name'), {'name'}),
+    (re.compile(r'health/save|control/banishment'), {'characteristics'}),
+    (re.compile(r'keywords'), {'keywords'}),
+]
+
+# 'Faction Pack - Seraphon', 'Battletome Supplement - Blades of Khorne',
+# 'Destruction Battletome - Bonesplitterz' (and the 'Battletime' typo)
+SOURCE_FILE_PATTERN = re.compile(
+    r'^(?:Faction Pack|(?:\w+ )?Battle ?t[io]me(?: Supplement)?) - (?P<faction>.+)$',
+    re.IGNORECASE
+)
+
+# Lines that repeat on every page and carry no warscroll data
+PAGE_NOISE_PATTERN = re.compile(
+    r'^(?:[A-Z][a-z]+ \d{4}|Permission to download/print.*|.*© Copyright Games Workshop.*)$'
+)
+PAGE_MARKER_PATTERN = re.compile(r'^--- Page (\d+) ---$')
+WARSCROLL_HEADER_PATTERN = re.compile(r'•\s*(.+?)\s+WARSCROLL\s*•')
+WEAPONS_HEADER_PATTERN = re.compile(r'^(RANGED|MELEE) WEAPONS\b')
+
+PHASES = r'(?:Hero|Movement|Shooting|Charge|Combat|End of Turn)'
+TIMING = (
+    r'(?:Once Per (?:Turn|Battle(?: Round)?)(?: \(Army,?\))?,?\s*)?'
+    r'(?:Passive|Reaction:.*|Deployment Phase|'
+    rf'(?:Your|Any|Enemy) {PHASES} Phase|'
+    r'(?:Start|End) of (?:Your|Any|Enemy|the) (?:Turn|Battle Round)|'
+    r'Start of Battle Round)'
+)
+TIMING_PATTERN = re.compile(rf'^(?P<timing>{TIMING})(?:\s+(?P<value>\d+))?$')
+# Two-column text puts both columns' timings on one line ('Passive Passive',
+# 'Your Hero Phase 6 Your Hero Phase'), or a timing beside the other column's text
+TIMING_PREFIX_PATTERN = re.compile(rf'(?P<timing>{TIMING})(?=\s|$)(?:\s+(?P<value>\d+)(?=\s|$))?\s*')
+# 'Once Per Turn (Army),' wrapped above the rest of its timing
+TIMING_QUALIFIER_PATTERN = re.compile(r'^Once Per (?:Turn|Battle(?: Round)?)(?: \(Army,?\))?,$')
+# 'NAME:' openings of the abilities on the line below a two-column timing line
+COLUMN_NAME_PATTERN = re.compile(r"(?:^|(?<=\s))([A-Z0-9'‘][A-Z0-9\s'’\-,!?&]*[A-Z0-9!?'’]):")
+# Any line starting with a timing ends the weapon tables, even when two-column
+# text puts two timings on one line ('Passive Once Per Battle, Any Combat Phase')
+TIMING_START_PATTERN = re.compile(
+    rf'^(?:Once Per (?:Turn|Battle)|Passive\b|Reaction:|Deployment Phase|'
+    rf'(?:Your|Any|Enemy) {PHASES} Phase|(?:Start|End) of )'
+)
+# Weapon loadout notes printed under a weapons table, not part of any row
+LOADOUT_NOTE_PATTERN = re.compile(r'^(?:Each model|This unit|Any model|\d+ in every|\d+ models?)\b')
+ABILITY_NAME_PATTERN = re.compile(r'^(?P<name>[A-Z0-9][A-Z0-9\s\'’\-,!?&]+?)(?::\s*(?P<rest>.*))?$')
+ABILITY_FIELD_PATTERN = re.compile(r'^(?P<field>Declare|Effect|Keywords)(?::|\s|$)\s*(?P<rest>.*)$')
+
+DICE = r'(?:\d*D\d+(?:\+\d+)?|\d+)'
+MELEE_ROW_PATTERN = re.compile(
+    rf'^(?P<pre>.*?)\s*(?P<attacks>{DICE})\s+(?P<hit>\d\+|-)\s+(?P<wound>\d\+|-)\s+'
+    rf'(?P<rend>\d+|-)\s+(?P<damage>{DICE})(?:\s+(?P<post>.*))?$'
+)
+RANGED_ROW_PATTERN = re.compile(
+    rf'^(?P<pre>.*?)\s*(?P<range>\d+")\s+(?P<attacks>{DICE})\s+(?P<hit>\d\+|-)\s+'
+    rf'(?P<wound>\d\+|-)\s+(?P<rend>\d+|-)\s+(?P<damage>{DICE})(?:\s+(?P<post>.*))?$'
+)
+WEAPON_ABILITY_PATTERN = re.compile(
+    r'^(?:Anti-|Crit\b|Charge\b|Companion\b|Shoot in Combat\b)'
+)
+# A weapon ability following name text on the same line: 'Manticore's Claws Anti-Monster (+1 Rend),'
+INLINE_WEAPON_ABILITY_PATTERN = re.compile(
+    r'(?<=\S)\s+(?=Anti-[A-Z]|Crit \(|Charge \(|Companion\b|Shoot in Combat\b)'
+)
+# Plausible weapon characteristics; anything outside is a parsing error
+MAX_ATTACKS, MAX_REND, MAX_DAMAGE = 20, 3, 6
+
+MOVE_PATTERN = re.compile(r'(?<![\d(])(\d*D\d+|\d+|\*)"')
+HEALTH_SAVE_PATTERN = re.compile(r'(?<![\d(+])(\d{1,2})\s*([2-6]\+|-)(?=A|\s|$)')
+LEADING_NUMBER_PATTERN = re.compile(r'^(\d+|-)(?=\s|$)')
+NAME_WORD_PATTERN = re.compile(r'^[A-Z][A-Z\'’\-!]+$')
+# Bold text in some packs is extracted with every character doubled: 'CCrriitt'
+DOUBLED_TOKEN_PATTERN = re.compile(r'(?<!\S)(?:(\S)\1){2,}(?!\S)')
+# Two-character bold stats ('22') are left alone by that, since 11 attacks is valid
+DOUBLED_DIGIT_PATTERN = re.compile(r'^(\d)\1$')
+# Section headings such as 'MARK OF CHAOS' that follow a weapons table
+SECTION_HEADING_PATTERN = re.compile(r'^(?:[A-Z][A-Z\'\-]*(?:\s+|$)){2,}')
+TYPOGRAPHIC_QUOTES = str.maketrans({'’': "'", '‘': "'", '“': '"', '”': '"'})
+HEADER_WORDS = {'MOVE', 'CONTROL', 'BANISHMENT', 'HEALTH', 'SAVE', 'WARSCROLL'}
+# Some packs (Ogor Mawtribes, Hedonites of Slaanesh) split the characteristic
+# labels into fragments on lines of their own, each value on its own line:
+# 'HE' / '18' / 'CO' ... '4+' / 'S AV E' / 'A LT H' / 'MOV E' / '15' / 'N T ROL'
+SPLIT_LABELS = {
+    'HE': 'HEALTH', 'A LT H': 'HEALTH', 'S AV E': 'SAVE', 'MOV E': 'MOVE',
+    'CO': 'CONTROL', 'N T ROL': 'CONTROL',
+    'B': 'BANISHMENT', 'AN': 'BANISHMENT', 'ISH M': 'BANISHMENT', 'ISH MEN': 'BANISHMENT',
+    'EN': 'BANISHMENT', 'T': 'BANISHMENT',
+}
+MOVE_VALUE_PATTERN = re.compile(r'^(\d*D\d+|\d+|\*)"$')
+SAVE_VALUE_PATTERN = re.compile(r'^([2-6]\+|-)$')
+BANISHMENT_VALUE_PATTERN = re.compile(r'^(\d+\+)$')
+LOWERCASE_NAME_WORDS = {'of', 'the', 'on', 'with', 'and', 'in', 'a'}
+
 def slugify(text):
     """Convert text to slug format."""
     text = text.lower()
@@ -17,121 +165,959 @@ def slugify(text):
     text = re.sub(r'[-\s]+', '-', text)
     return text.strip('-')
 
-def extract_unit_name(lines, start_idx):
-    """Extract unit name from warscroll header."""
-    # Look for the unit name in the next few lines after WARSCROLL
-    for i in range(start_idx, min(start_idx + 10, len(lines))):
-        line = lines[i].strip()
-        # Unit names are often in ALL CAPS and substantial
-        if line.isupper() and len(line) > 3 and 'WARSCROLL' not in line and 'MOVE' not in line:
-            # Handle multi-line names
-            name = line
-            # Check if next line continues the name
-            if i + 1 < len(lines):
-                next_line = lines[i + 1].strip()
-                if next_line.isupper() and len(next_line) > 3 and 'CONTROL' not in next_line:
-                    name += ' ' + next_line
-            return name.strip()
-    return None
+def name_case(text):
+    """Title-case an ALL CAPS name: 'BE’LAKOR ON ROYAL TERRORGHEIST' -> 'Be’lakor on Royal Terrorgheist'."""
+    words = []
+    for n, word in enumerate(text.lower().split()):
+        if n and word in LOWERCASE_NAME_WORDS:
+            words.append(word)
+        else:
+            words.append('-'.join(part[:1].upper() + part[1:] for part in word.split('-')))
+    return ' '.join(words)
 
-def parse_faction_text(text_file, faction_id):
-    """Parse a faction text file and extract basic unit information."""
-    with open(text_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    units = []
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-
-        # Find warscroll markers
-        if 'WARSCROLL' in line and faction_id.upper().replace('-', ' ') in line.upper():
-            # Extract unit name
-            unit_name = extract_unit_name(lines, i + 1)
-
-            if unit_name:
-                # Clean up unit name
-                unit_name = re.sub(r'\s+', ' ', unit_name)
-                unit_name = unit_name.replace('ON ROYAL ', 'on Royal ')
-                unit_name = unit_name.replace('MORTARCH OF ', 'Mortarch of ')
-
-                # Create unit stub
-                unit_id = slugify(unit_name)
-
-                unit_stub = {
-                    "id": unit_id,
-                    "name": unit_name.title(),
-                    "factionId": faction_id,
-                    "characteristics": {
-                        "move": "6\"",  # Default, needs manual correction
-                        "health": 1,
-                        "save": "4+",
-                        "control": 1
-                    },
-                    "meleeWeapons": [],
-                    "abilities": [],
-                    "keywords": {
-                        "unit": ["Infantry"],
-                        "faction": ["Death", faction_id.replace('-', ' ').title()]
-                    },
-                    "sourceFile": text_file.name,
-                    "extractedAt": datetime.now().isoformat() + 'Z',
-                    "_needs_manual_review": True
+def join_text(lines):
+    """Join wrapped lines into a single string, re-joining hyphenated words."""
+    text = ''
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if text.endswith('-') and len(text) > 1 and text[-2].isalpha():
+            text += line
+        else:
+            text = f"{text} {line}" if text else line
+    return text
+
+def clean_line(line):
+    """Strip a line, straighten quotes and undo doubled-character extraction."""
+    line = line.strip().translate(TYPOGRAPHIC_QUOTES)
+    return DOUBLED_TOKEN_PATTERN.sub(lambda m: m.group(0)[::2], line)
+
+def parse_value(value):
+    """Convert a numeric stat to int, leaving dice and '-' as strings."""
+    return int(value) if value.isdigit() else value
+
+def undouble_stats(match):
+    """Return a weapon row's attacks, rend and damage with bold doubling undone.
+
+    Rend and damage never reach 11, so '11'/'22' there is a doubled bold digit;
+    attacks is only undoubled when the same row shows doubling elsewhere.
+    """
+    stats = {field: match.group(field) for field in ('attacks', 'rend', 'damage')}
+    doubled = False
+    for field in ('rend', 'damage'):
+        if DOUBLED_DIGIT_PATTERN.match(stats[field]):
+            stats[field] = stats[field][0]
+            doubled = True
+    if doubled and DOUBLED_DIGIT_PATTERN.match(stats['attacks']):
+        stats['attacks'] = stats['attacks'][0]
+    return stats
+
+def trailing_name(line):
+    """Return the trailing run of ALL CAPS words on a header line, if any.
+
+    Header lines mix the name with the vertically-printed characteristic labels,
+    e.g. 'A L 2 3+A V LIBERATORS' -> 'LIBERATORS'.
+    """
+    words = []
+    for token in reversed(line.split()):
+        # Doubled vertical labels ('TT HH SS') are not part of the name
+        if NAME_WORD_PATTERN.match(token) and token not in HEADER_WORDS and len(set(token)) > 1:
+            words.append(token)
+        else:
+            break
+    return ' '.join(reversed(words))
+
+def parse_split_header(lines):
+    """Parse a header whose characteristic labels are split across lines.
+
+    Labels and values each sit on a line of their own (see SPLIT_LABELS): the
+    health value follows 'HE', the save value precedes 'S AV E', and the
+    control or banishment value follows 'MOV E' (after the move value, when
+    that is printed there). Name lines after that value are the subtitle if the
+    name was already printed above it.
+    """
+    characteristics = {'move': '-', 'health': None, 'save': None}
+    before, after = [], []
+    labels_seen = False
+
+    for n, line in enumerate(lines):
+        line = WARSCROLL_HEADER_PATTERN.sub(' ', line).strip()
+        label = SPLIT_LABELS.get(line)
+
+        if line == 'HE' and characteristics['health'] is None:
+            # The move value can sit between the label and the health value
+            health = [value for value in lines[n + 1:n + 3] if value.isdigit()]
+            if health:
+                characteristics['health'] = int(health[0])
+        elif line == 'S AV E' and characteristics['save'] is None:
+            # ...and the name between the save value and its label
+            save = [value for value in lines[max(n - 2, 0):n] if SAVE_VALUE_PATTERN.match(value)]
+            if save:
+                characteristics['save'] = save[-1]
+        elif line == 'MOV E':
+            labels_seen = True
+            rest = [value for value in lines[n + 1:n + 4] if value not in SPLIT_LABELS][:2]
+            if rest and MOVE_VALUE_PATTERN.match(rest[0]):
+                characteristics['move'] = rest.pop(0)
+            if rest and rest[0].isdigit():
+                characteristics['control'] = int(rest[0])
+            elif rest and BANISHMENT_VALUE_PATTERN.match(rest[0]):
+                characteristics['banishment'] = rest[0]
+        elif characteristics['move'] == '-' and MOVE_VALUE_PATTERN.match(line):
+            characteristics['move'] = line
+
+        if label or not line or trailing_name(line) != line:
+            continue
+        (after if labels_seen else before).append(line)
+
+    mount_parts = [phrase for phrase in after if phrase.startswith(('ON ', 'WITH '))]
+    after = [phrase for phrase in after if phrase not in mount_parts]
+    if before:
+        name_parts, subtitle = before, join_text(after) or None
+    else:
+        name_parts, subtitle = after, None
+    return join_text(name_parts + mount_parts), subtitle, characteristics
+
+def parse_header(lines):
+    """Parse the characteristics, name and subtitle from a warscroll header."""
+    if 'MOV E' in lines:
+        return parse_split_header(lines)
+
+    characteristics = {'move': '-', 'health': None, 'save': None}
+    name_parts, mount_parts, subtitle = [], [], None
+    number_lines = []
+
+    for line in lines:
+        # Drop the "• FACTION WARSCROLL •" banner, keeping anything around it,
+        # and the template's unfilled 'WARSCROLL SUBTITLE' placeholder
+        line = WARSCROLL_HEADER_PATTERN.sub(' ', line).strip()
+        line = line.replace('WARSCROLL SUBTITLE', '').strip()
+
+        if characteristics['move'] == '-':
+            move = MOVE_PATTERN.search(line)
+            if move:
+                characteristics['move'] = f'{move.group(1)}"'
+                line = MOVE_PATTERN.sub(' ', line).strip()
+
+        if characteristics['health'] is None:
+            stats = HEALTH_SAVE_PATTERN.search(line)
+            if stats:
+                characteristics['health'] = int(stats.group(1))
+                characteristics['save'] = stats.group(2)
+
+        if line in ('CONTROL', 'BANISHMENT') or line.startswith(('CONTROL ', 'BANISHMENT ')):
+            # The value is on the nearest preceding line that starts with one
+            field = line.split()[0].lower()
+            value = number_lines[-1] if number_lines else '-'
+            if field == 'control':
+                characteristics['control'] = int(value) if value.isdigit() else 0
+            else:
+                characteristics['banishment'] = value
+            line = line[len(field):].strip()
+
+        number = LEADING_NUMBER_PATTERN.match(line) or re.match(r'^(\d\+)$', line)
+        if number:
+            number_lines.append(number.group(1))
+
+        phrase = trailing_name(line)
+        if not phrase:
+            continue
+        if phrase.startswith(('ON ', 'WITH ')):
+            mount_parts.append(phrase)
+        elif number and subtitle is None and name_parts:
+            # Subtitles share a line with the control value: '10 SUPREME LORD OF THE UNDEAD'
+            subtitle = phrase
+        else:
+            name_parts.append(phrase)
+
+    name = ' '.join(name_parts + mount_parts)
+    return name, subtitle, characteristics
+
+def split_weapon_fragment(text):
+    """Split name text from a weapon ability printed after it on the same line.
+
+    'Manticore's Claws Anti-Monster (+1 Rend),' -> ["Manticore's Claws", 'Anti-Monster (+1 Rend),']
+    """
+    if not text:
+        return []
+    if WEAPON_ABILITY_PATTERN.match(text):
+        return [text]
+    return INLINE_WEAPON_ABILITY_PATTERN.split(text, maxsplit=1)
+
+def parse_weapon_table(lines, ranged):
+    """Parse a RANGED or MELEE WEAPONS table into weapon dicts.
+
+    Names and weapon abilities can wrap onto lines above or below the stat row,
+    so non-row lines are held until the next row and then attached to it or to
+    the previous row: a fragment ending in a comma continues onto the next row,
+    other ability fragments finish the previous row, and name fragments go to
+    the next row only if its stat line has no name of its own.
+    """
+    row_pattern = RANGED_ROW_PATTERN if ranged else MELEE_ROW_PATTERN
+    rows, pending = [], []
+
+    for line in lines + [None]:
+        match = row_pattern.match(line) if line is not None else None
+        if line is not None and not match:
+            pending.extend(split_weapon_fragment(line))
+            continue
+
+        row = None
+        if match:
+            pre = split_weapon_fragment(match.group('pre').strip())
+            row = {
+                'match': match,
+                'name': [part for part in pre if not WEAPON_ABILITY_PATTERN.match(part)],
+                'ability': [part for part in pre if WEAPON_ABILITY_PATTERN.match(part)],
+            }
+            if match.group('post'):
+                row['ability'].append(match.group('post'))
+
+        previous = rows[-1] if rows else None
+        prefix = {'name': [], 'ability': []}
+        for fragment in pending:
+            key = 'ability' if WEAPON_ABILITY_PATTERN.match(fragment) else 'name'
+            if row is None:
+                to_next = False
+            elif previous is None or fragment.endswith(','):
+                to_next = True
+            elif key == 'name':
+                to_next = not row['name']
+            else:
+                to_next = False
+
+            if to_next:
+                prefix[key].append(fragment)
+            elif previous is not None:
+                previous[key].append(fragment)
+        pending = []
+
+        if row is not None:
+            row['name'] = prefix['name'] + row['name']
+            row['ability'] = prefix['ability'] + row['ability']
+            rows.append(row)
+
+    weapons = []
+    for row in rows:
+        match = row['match']
+        stats = undouble_stats(match)
+        weapon = {'name': join_text(row['name'])}
+        if ranged:
+            weapon['range'] = match.group('range')
+        weapon.update({
+            'attacks': parse_value(stats['attacks']),
+            'hit': match.group('hit'),
+            'wound': match.group('wound'),
+            'rend': parse_value(stats['rend']),
+            'damage': parse_value(stats['damage']),
+        })
+        ability = join_text(row['ability'])
+        if ability and ability != '-':
+            weapon['ability'] = ability
+        weapons.append(weapon)
+
+    return weapons
+
+def split_timings(line):
+    """Split the ability timings off the start of a line.
+
+    Returns:
+        (timings, rest) - rest is the text after the last timing
+    """
+    timings, position = [], 0
+    while position < len(line):
+        match = TIMING_PREFIX_PATTERN.match(line, position)
+        if not match:
+            break
+        timings.append(match.group('timing').strip())
+        position = match.end()
+    return timings, line[position:]
+
+def parse_abilities(lines):
+    """Parse ability blocks: timing line, NAME: description, Declare, Effect, Keywords.
+
+    Plain-extracted two-column warscrolls interleave two abilities line by
+    line. Their timing line holds both timings (or a timing beside the other
+    column's text); those abilities get their timing and, where the next line
+    shows one 'NAME:' per column, their names, but none of the interleaved text.
+
+    Returns:
+        (abilities, interleaved) - interleaved counts the abilities whose text
+        could not be separated
+    """
+    abilities = []
+    current, field = None, None
+    qualifier, columns = None, None
+    interleaved = 0
+
+    for line in lines:
+        if qualifier:
+            line, qualifier = f"{qualifier} {line}", None
+        elif TIMING_QUALIFIER_PATTERN.match(line):
+            qualifier = line
+            continue
+
+        timing = TIMING_PATTERN.match(line)
+        timings, rest = (None, None) if timing else split_timings(line)
+        if timing or timings:
+            for timing_text in [timing.group('timing')] if timing else timings:
+                current = {
+                    'name': [], 'timing': timing_text,
+                    'description': [], 'declare': [], 'effect': [], 'keywords': []
                 }
+                abilities.append(current)
+            field = 'name'
+            columns = None
+            if not timing:
+                columns = abilities[-len(timings):] if not rest else []
+                interleaved += len(timings)
+                current = None
+            continue
 
-                units.append(unit_stub)
+        if columns is not None:
+            # Only the NAME: openings on the first line can be told apart
+            names = [name for name in COLUMN_NAME_PATTERN.findall(line)
+                     if sum(c.isalpha() for c in name) > 1]
+            if columns and len(names) == len(columns):
+                for ability, name in zip(columns, names):
+                    ability['name'].append(name.strip())
+            columns = []
+            continue
 
-        i += 1
+        if current is None:
+            # Text before the first ability, e.g. terrain feature notes
+            continue
 
-    return units
+        labelled = ABILITY_FIELD_PATTERN.match(line)
+        if labelled and current['name']:
+            field = labelled.group('field').lower()
+            current[field].append(labelled.group('rest'))
+            continue
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python extract_units_from_text.py <faction-id>")
-        print("Example: python extract_units_from_text.py flesh-eater-courts")
-        sys.exit(1)
+        if field == 'name':
+            name = ABILITY_NAME_PATTERN.match(line)
+            if name:
+                current['name'].append(name.group('name'))
+                if name.group('rest') is not None:
+                    current['description'].append(name.group('rest'))
+                    field = 'description'
+                continue
+            field = 'description'
 
-    faction_id = sys.argv[1]
+        current[field].append(line)
 
-    # Find the text file
-    docs_path = Path(__file__).parent.parent / 'docs' / 'references' / 'factions'
+    parsed = []
+    for ability in abilities:
+        entry = {
+            'name': name_case(join_text(ability['name'])),
+            'timing': ability['timing'],
+            'description': join_text(ability['description']),
+        }
+        if ability['declare']:
+            entry['declare'] = join_text(ability['declare'])
+        entry['effect'] = join_text(ability['effect'])
+        keywords = join_text(ability['keywords'])
+        if keywords:
+            entry['keywords'] = [k.strip() for k in keywords.split(',') if k.strip()]
+        parsed.append(entry)
 
-    # Look for matching faction pack
-    text_files = list(docs_path.glob(f"*{faction_id.replace('-', ' ').title()}*.txt"))
+    return parsed, interleaved
 
-    if not text_files:
-        # Try variations
-        text_files = list(docs_path.glob(f"Faction Pack*.txt"))
-        text_files = [f for f in text_files if faction_id.replace('-', ' ') in f.name.lower().replace('  ', ' ')]
+def split_keywords(line):
+    """Split a comma-separated keyword line, keeping commas inside parentheses."""
+    return [k.strip() for k in re.split(r',\s*(?![^(]*\))', line or '') if k.strip()]
 
-    if not text_files:
-        print(f"No text file found for faction: {faction_id}")
-        sys.exit(1)
+def parse_warscroll(lines):
+    """Parse one warscroll's lines into its parts with a single state machine.
 
-    text_file = text_files[0]
-    print(f"Processing: {text_file.name}")
+    Returns a dict with name, subtitle, characteristics, rangedWeapons,
+    meleeWeapons, abilities, interleavedAbilities (see parse_abilities),
+    splitLabels (see parse_split_header) and keywords.
+    """
+    state = 'header'
+    sections = {'header': [], 'ranged': [], 'melee': [], 'abilities': []}
+    unit_keywords, faction_keywords = None, None
 
-    # Extract units
-    units = parse_faction_text(text_file, faction_id)
+    for n, line in enumerate(lines):
+        if line == 'KEYWORDS':
+            # Unit keywords sit just above the KEYWORDS label, faction keywords below
+            if sections[state] and n and lines[n - 1] == sections[state][-1]:
+                unit_keywords = sections[state].pop()
+            faction_keywords = lines[n + 1] if n + 1 < len(lines) else None
+            break
 
-    print(f"\nFound {len(units)} units:")
-    for unit in units:
-        print(f"  - {unit['name']} ({unit['id']})")
+        weapons_header = WEAPONS_HEADER_PATTERN.match(line)
+        if weapons_header:
+            state = weapons_header.group(1).lower()
+            continue
+
+        if state != 'abilities' and TIMING_START_PATTERN.match(line):
+            state = 'abilities'
+        elif state in ('ranged', 'melee') and (
+                LOADOUT_NOTE_PATTERN.match(line) or SECTION_HEADING_PATTERN.match(line)):
+            state = 'abilities'
+
+        sections[state].append(line)
+
+    name, subtitle, characteristics = parse_header(sections['header'])
+    abilities, interleaved = parse_abilities(sections['abilities'])
+
+    return {
+        'name': name,
+        'subtitle': subtitle,
+        'characteristics': characteristics,
+        'rangedWeapons': parse_weapon_table(sections['ranged'], ranged=True),
+        'meleeWeapons': parse_weapon_table(sections['melee'], ranged=False),
+        'abilities': abilities,
+        'interleavedAbilities': interleaved,
+        'splitLabels': 'MOV E' in sections['header'],
+        'keywords': {
+            'unit': split_keywords(unit_keywords),
+            'faction': split_keywords(faction_keywords),
+        },
+    }
+
+def normalize_faction_name(name):
+    """Normalize a faction name for comparison: 'Flesh-eater Courts' -> 'FLESH EATER COURTS'."""
+    return re.sub(r'[-\s]+', ' ', name.upper()).strip()
+
+def iter_lines(data, offset=0):
+    """Yield (start, end, line) for each line of raw file bytes, with byte offsets."""
+    for raw_line in data.splitlines(keepends=True):
+        yield offset, offset + len(raw_line), raw_line.decode('utf-8')
+        offset += len(raw_line)
+
+def iter_warscroll_blocks(lines):
+    """Yield (banner, page_number, start, end, lines) for each warscroll, in one pass.
+
+    `lines` are (start, end, line) tuples from iter_lines(). A warscroll starts
+    at the top of its page (or after the previous warscroll on the same page)
+    and ends after the faction keywords line that follows 'KEYWORDS'; start and
+    end are the byte offsets of that span. The banner is the faction name from
+    '• FACTION WARSCROLL •', so callers can skip e.g. Spearhead warscrolls.
+    """
+    page_number = None
+    banner, block, block_start, block_end = None, [], None, None
+
+    for start, end, raw_line in lines:
+        line = clean_line(raw_line)
+
+        marker = PAGE_MARKER_PATTERN.match(line)
+        if marker:
+            if banner:
+                yield banner, page_number, block_start, block_end, block
+            page_number = int(marker.group(1))
+            banner, block = None, []
+            continue
+
+        if not line or PAGE_NOISE_PATTERN.match(line):
+            continue
+
+        header = WARSCROLL_HEADER_PATTERN.search(line)
+        if header and not banner:
+            banner = header.group(1)
+
+        if not block:
+            block_start = start
+        block.append(line)
+        block_end = end
+
+        if banner and len(block) > 1 and block[-2] == 'KEYWORDS':
+            yield banner, page_number, block_start, block_end, block
+            banner, block = None, []
 
-    # Create output directory
-    output_dir = Path(__file__).parent.parent / 'packages' / 'shared' / 'data' / 'units' / faction_id
+    if banner:
+        yield banner, page_number, block_start, block_end, block
+
+def validate_unit(unit):
+    """Return a list of problems that need a human to look at the unit."""
+    issues = []
+    characteristics = unit['characteristics']
+    unit_keywords = unit['keywords']['unit']
+
+    if not unit['name']:
+        issues.append('missing name')
+    if characteristics['health'] is None or characteristics['save'] is None:
+        issues.append('missing health/save')
+    if 'control' not in characteristics and 'banishment' not in characteristics:
+        issues.append('missing control/banishment')
+    if not unit.get('meleeWeapons') and not any(
+            k in unit_keywords for k in ('Manifestation', 'Faction Terrain')):
+        issues.append('no melee weapons')
+    if not unit['keywords']['faction']:
+        issues.append('missing faction keywords')
+    if not unit['abilities']:
+        issues.append('no abilities')
+    for ability in unit['abilities']:
+        if not ability['name'] or not ability['effect']:
+            issues.append(f"incomplete ability under '{ability['timing']}'")
+    for weapon in unit.get('rangedWeapons', []) + unit.get('meleeWeapons', []):
+        if not weapon['name']:
+            issues.append('unnamed weapon')
+        elif INLINE_WEAPON_ABILITY_PATTERN.search(weapon['name']):
+            issues.append(f"weapon ability in the name of '{weapon['name']}'")
+        for field, limit in (('attacks', MAX_ATTACKS), ('rend', MAX_REND), ('damage', MAX_DAMAGE)):
+            if isinstance(weapon[field], int) and weapon[field] > limit:
+                issues.append(f"{field} {weapon[field]} out of range on '{weapon['name']}'")
+        for field in ('hit', 'wound'):
+            if weapon[field] not in ('2+', '3+', '4+', '5+', '6+', '-'):
+                issues.append(f"{field} {weapon[field]} out of range on '{weapon['name']}'")
+
+    return issues
+
+def build_unit(block, page_number, faction_id, text_file, extracted_at):
+    """Parse one warscroll block into a unit dict, flagging it if validation fails."""
+    warscroll = parse_warscroll(block)
+    unit_name = name_case(warscroll['name'])
+
+    unit = {
+        'id': slugify(unit_name),
+        'name': unit_name,
+    }
+    if warscroll['subtitle']:
+        unit['subtitle'] = name_case(warscroll['subtitle'])
+    unit['factionId'] = faction_id
+    unit['characteristics'] = warscroll['characteristics']
+    if warscroll['rangedWeapons']:
+        unit['rangedWeapons'] = warscroll['rangedWeapons']
+    unit['meleeWeapons'] = warscroll['meleeWeapons']
+    unit['abilities'] = warscroll['abilities']
+    unit['keywords'] = warscroll['keywords']
+    unit['sourceFile'] = Path(text_file).with_suffix('.pdf').name
+    unit['extractedAt'] = extracted_at
+
+    issues = validate_unit(unit)
+    if warscroll['interleavedAbilities']:
+        issues.append(f"interleaved two-column ability text ({warscroll['interleavedAbilities']} "
+                      f"abilities); re-extract the PDF with --layout columns")
+    if warscroll['splitLabels']:
+        issues.append("split-label layout: weapon tables are printed column by column "
+                      "and are not parsed; enter the weapons by hand")
+    if issues:
+        unit['_needs_manual_review'] = True
+        unit['_review_notes'] = [f"page {page_number}: {issue}" for issue in issues]
+
+    return unit
+
+def parse_faction_text(text_file, faction_id):
+    """Parse a faction text file and extract full unit warscrolls."""
+    with open(text_file, 'rb') as f:
+        data = f.read()
+
+    faction_name = normalize_faction_name(faction_id)
+    extracted_at = datetime.now().isoformat() + 'Z'
+
+    return [
+        build_unit(block, page_number, faction_id, text_file, extracted_at)
+        for banner, page_number, _, _, block in iter_warscroll_blocks(iter_lines(data))
+        if normalize_faction_name(banner) == faction_name
+    ]
+
+def warscroll_index_path(text_file):
+    """Return the path of the warscroll index cached next to a text file."""
+    text_file = Path(text_file)
+    return text_file.with_name(f'.{text_file.stem}{INDEX_SUFFIX}')
+
+def build_warscroll_index(text_file):
+    """Scan a text file once and record every warscroll's byte span and page."""
+    with open(text_file, 'rb') as f:
+        data = f.read()
+
+    warscrolls = []
+    for banner, page_number, start, end, block in iter_warscroll_blocks(iter_lines(data)):
+        name = name_case(parse_warscroll(block)['name'])
+        warscrolls.append({
+            'id': slugify(name),
+            'name': name,
+            'banner': banner,
+            'page': page_number,
+            'offset': start,
+            'length': end - start,
+        })
+
+    return {
+        'version': INDEX_VERSION,
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'warscrolls': warscrolls,
+    }
+
+def load_warscroll_index(text_file):
+    """Load the cached warscroll index for a text file, rebuilding it if stale.
+
+    The cache is trusted while the file's mtime and size match. If they don't,
+    the content hash decides whether the warscrolls actually moved; a touched
+    but unchanged file only gets its mtime refreshed.
+    """
+    text_file = Path(text_file)
+    index_path = warscroll_index_path(text_file)
+    stat = text_file.stat()
+
+    index = None
+    if index_path.exists():
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != INDEX_VERSION:
+            index = None
+
+    if index and index['mtime'] == stat.st_mtime and index['size'] == stat.st_size:
+        return index
+
+    if not index or index['sha256'] != file_sha256(text_file):
+        index = build_warscroll_index(text_file)
+
+    index['mtime'] = stat.st_mtime
+    index['size'] = stat.st_size
+    write_json_atomic(index_path, index)
+    return index
+
+def find_warscroll(text_files, faction_id, unit):
+    """Find a unit by id or name in the faction's warscroll indexes.
+
+    Returns (text_file, entry), or (None, None) if no warscroll matches.
+    """
+    faction_name = normalize_faction_name(faction_id)
+    wanted = slugify(unit)
+    for text_file in text_files:
+        for entry in load_warscroll_index(text_file)['warscrolls']:
+            if normalize_faction_name(entry['banner']) == faction_name and entry['id'] == wanted:
+                return text_file, entry
+    return None, None
+
+def read_warscroll(text_file, entry, faction_id):
+    """Parse a single indexed warscroll by seeking straight to its bytes via mmap."""
+    with open(text_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = entry['offset']
+        data = mm[start:start + entry['length']]
+
+    for _, _, _, _, block in iter_warscroll_blocks(iter_lines(data, start)):
+        extracted_at = datetime.now().isoformat() + 'Z'
+        return build_unit(block, entry['page'], faction_id, text_file, extracted_at)
+    return None
+
+def discover_faction_files(docs_path=DOCS_PATH):
+    """Map each faction id to its source text files in one directory listing.
+
+    Faction packs come first, followed by Battletome/Supplement variants, whose
+    warscrolls fill in units missing from the pack.
+    """
+    faction_files = {}
+    for text_file in sorted(Path(docs_path).glob('*.txt')):
+        match = SOURCE_FILE_PATTERN.match(text_file.stem)
+        if match:
+            faction_files.setdefault(slugify(match.group('faction')), []).append(text_file)
+
+    for text_files in faction_files.values():
+        text_files.sort(key=lambda f: not f.name.startswith('Faction Pack'))
+    return faction_files
+
+def parse_faction(faction_id, text_files):
+    """Parse all of a faction's text files, keeping the first warscroll for each unit id.
+
+    Runs in a worker process for --all, so it only parses and returns
+    (faction_id, units); files are written by the parent.
+    """
+    units = {}
+    for text_file in text_files:
+        for unit in parse_faction_text(text_file, faction_id):
+            units.setdefault(unit['id'], unit)
+    return faction_id, list(units.values())
+
+def canonical_unit(unit):
+    """Serialize a unit for change detection, ignoring the extraction timestamp."""
+    content = {key: value for key, value in unit.items() if key not in VOLATILE_FIELDS}
+    return json.dumps(content, sort_keys=True, ensure_ascii=False)
+
+def review_note_fields(note):
+    """Return the fields a review note is about, or None for the whole unit."""
+    for pattern, fields in REVIEW_NOTE_FIELDS:
+        if pattern.search(note):
+            return fields
+    return None
+
+def merge_unit(existing, extracted):
+    """Merge an extracted unit into an existing file without clobbering curated data.
+
+    '_provenance' maps each top-level field to 'extracted' or 'manual'. Fields
+    marked 'manual', and fields already in the file that have no provenance
+    (everything in a hand-written file), are kept as they are. Everything else
+    is replaced by the extracted value, and 'extracted' fields the parser no
+    longer finds are dropped. To curate an extracted field, edit it and set its
+    provenance to 'manual'.
+
+    An empty extracted list (no weapons or abilities found) is only applied
+    over a field that was itself extracted. Review notes are kept only for
+    the fields the file takes from the extraction (see REVIEW_NOTE_FIELDS).
+    """
+    provenance = dict(existing.get('_provenance', {}))
+    # An empty list means the parser found nothing, not that the unit has none
+    extracted = {field: value for field, value in extracted.items()
+                 if value != [] or provenance.get(field) == 'extracted'}
+    merged = {field: value for field, value in existing.items() if field not in METADATA_FIELDS}
+
+    for field in list(merged):
+        if provenance.get(field) == 'extracted' and field not in extracted:
+            del merged[field]
+            del provenance[field]
+
+    applied = False
+    for field, value in extracted.items():
+        if field in METADATA_FIELDS:
+            continue
+        origin = provenance.get(field, 'manual' if field in existing else 'extracted')
+        provenance[field] = origin
+        if origin == 'extracted':
+            applied = applied or merged.get(field) != value
+            merged[field] = value
+    for field in merged:
+        provenance.setdefault(field, 'manual')
+
+    values = {'id': extracted['id'], 'factionId': extracted['factionId']}
+    values.update(merged)
+    values['sourceFile'] = extracted['sourceFile']
+    values['extractedAt'] = extracted['extractedAt'] if applied else existing.get(
+        'extractedAt', extracted['extractedAt'])
+    provenance = {field: provenance[field] for field in merged}
+    # Review flags stay until an extraction validates cleanly, but only for
+    # problems in fields the file actually takes from the extraction
+    extracted_fields = {field for field, origin in provenance.items() if origin == 'extracted'}
+    notes = []
+    for note in extracted.get('_review_notes', []):
+        fields = review_note_fields(note)
+        if extracted_fields & (extracted_fields if fields is None else fields):
+            notes.append(note)
+    if notes:
+        values['_needs_manual_review'] = True
+        values['_review_notes'] = notes
+    # All-manual provenance is what a file without one means already
+    if '_provenance' in existing or 'extracted' in provenance.values():
+        values['_provenance'] = provenance
+
+    # Keep the existing file's key order so merges don't reshuffle curated files
+    order = [key for key in existing if key in values]
+    order += [key for key in extracted if key in values and key not in order]
+    order += [key for key in values if key not in order]
+    return {key: values[key] for key in order}
+
+def unit_paths(output_dir):
+    """Map each unit id in a faction directory to its file.
+
+    Hand-written files are not always named after their id
+    ('gaunt-summoner-on-disc.json' holds 'gaunt-summoner-on-disc-of-tzeentch').
+    """
+    paths = {}
+    for json_file in sorted(output_dir.glob('*.json')):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            paths.setdefault(json.load(f).get('id', json_file.stem), json_file)
+    return paths
+
+def write_units(faction_id, units, merge=False):
+    """Write one JSON file per unit, skipping files whose content is unchanged.
+
+    Existing files are found by their 'id' field, not their file name, or by
+    the id of the unit's name and subtitle together; new units are written to
+    '<id>.json'.
+
+    A file counts as unchanged when it matches the extracted unit apart from
+    'extractedAt', so re-running the extractor doesn't touch it (keeping git
+    and the TypeScript build caches quiet). With merge=True, existing files are
+    updated through merge_unit() instead of being overwritten.
+
+    Units without a health characteristic (which UnitCharacteristicsSchema
+    requires) are not written unless merging keeps an existing value; they are
+    counted as 'skipped'.
+
+    Returns:
+        (output_dir, counts) where counts has 'added', 'changed', 'unchanged'
+        and 'skipped'
+    """
+    output_dir = UNITS_DIR / faction_id
     output_dir.mkdir(parents=True, exist_ok=True)
+    counts = {'added': 0, 'changed': 0, 'unchanged': 0, 'skipped': 0}
+    paths = unit_paths(output_dir)
+
+    for unit in units:
+        output_file = paths.get(unit['id'], output_dir / f"{unit['id']}.json")
+        subtitled_id = slugify(f"{unit['name']} {unit['subtitle']}") if unit.get('subtitle') else None
+        folded = unit['id'] not in paths and subtitled_id in paths
+        if folded:
+            # Hand-written files fold the subtitle into the name and id:
+            # 'Lorai, Child of the Abyss' is extracted as Lorai / Child of the Abyss
+            output_file = paths[subtitled_id]
+        existing = None
+        if output_file.exists():
+            with open(output_file, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+        if folded:
+            folded_fields = {'id': existing['id'], 'name': existing['name']}
+            unit = {key: folded_fields.get(key, value) for key, value in unit.items() if key != 'subtitle'}
 
-    # Write unit stubs
+        if merge:
+            unit = merge_unit(existing or {}, unit)
+
+        if unit['characteristics'].get('health') is None:
+            counts['skipped'] += 1
+            continue
+        if existing is None:
+            counts['added'] += 1
+        elif canonical_unit(existing) == canonical_unit(unit):
+            counts['unchanged'] += 1
+            continue
+        else:
+            counts['changed'] += 1
+
+        write_unit_json(output_file, unit)
+
+    return output_dir, counts
+
+def format_counts(counts):
+    """Format write counts: '3 added, 1 changed, 40 unchanged, 2 skipped'."""
+    return ', '.join(f"{counts[key]} {key}" for key in ('added', 'changed', 'unchanged', 'skipped'))
+
+def extract_faction(faction_id, text_files, merge=False):
+    """Extract and write a single faction, listing every unit."""
+    for text_file in text_files:
+        print(f"Processing: {text_file.name}")
+
+    _, units = parse_faction(faction_id, text_files)
+    needs_review = [unit for unit in units if unit.get('_needs_manual_review')]
+
+    print(f"\nFound {len(units)} units:")
     for unit in units:
-        output_file = output_dir / f"{unit['id']}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(unit, f, indent=2, ensure_ascii=False)
+        flag = ' (needs review)' if unit.get('_needs_manual_review') else ''
+        print(f"  - {unit['name']} ({unit['id']}){flag}")
+
+    output_dir, counts = write_units(faction_id, units, merge)
+
+    print(f"\n✓ {len(units) - counts['skipped']} unit files in {output_dir}: {format_counts(counts)}")
+    if counts['skipped']:
+        print(f"NOTE: {counts['skipped']} units have no health value and were not written.")
+    if needs_review:
+        print(f"\nNOTE: {len(needs_review)} units failed validation and need manual review.")
+        print("Each is marked with '_needs_manual_review': true and '_review_notes'")
+
+def extract_unit(faction_id, text_files, unit, merge=False):
+    """Re-extract and write a single unit, located through the warscroll index."""
+    text_file, entry = find_warscroll(text_files, faction_id, unit)
+    if entry is None:
+        print(f"✗ No warscroll found for '{unit}' in {faction_id}")
+        return False
+
+    print(f"Processing: {text_file.name} (page {entry['page']}, byte {entry['offset']})")
+    parsed = read_warscroll(text_file, entry, faction_id)
+    output_dir, counts = write_units(faction_id, [parsed], merge)
+
+    flag = ' (needs review)' if parsed.get('_needs_manual_review') else ''
+    if counts['skipped']:
+        print(f"✗ {parsed['name']} ({parsed['id']}) has no health value; not written")
+        return False
+    status = 'Unchanged' if counts['unchanged'] else 'Wrote'
+    print(f"✓ {status} {parsed['name']} ({parsed['id']}){flag} in {output_dir}")
+    return True
+
+def extract_all(faction_files, workers, merge=False):
+    """Parse every faction concurrently and print a per-faction summary."""
+    print(f"Extracting {len(faction_files)} factions across {workers} workers...\n")
+    totals = {'added': 0, 'changed': 0, 'unchanged': 0, 'skipped': 0}
+    total_review, failed = 0, []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(parse_faction, faction_id, text_files): faction_id
+            for faction_id, text_files in faction_files.items()
+        }
+        for future in as_completed(futures):
+            faction_id = futures[future]
+            try:
+                _, units = future.result()
+            except Exception as e:
+                print(f"  ✗ {faction_id}: {e}")
+                failed.append(faction_id)
+                continue
+
+            _, counts = write_units(faction_id, units, merge)
+            for key in totals:
+                totals[key] += counts[key]
+            needs_review = sum(1 for unit in units if unit.get('_needs_manual_review'))
+            total_review += needs_review
+            sources = ', '.join(f.name for f in faction_files[faction_id])
+            print(f"  ✓ {faction_id}: {len(units)} units ({format_counts(counts)}), "
+                  f"{needs_review} need review ({sources})")
+
+    print(f"\n✓ {sum(totals.values()) - totals['skipped']} unit files for "
+          f"{len(faction_files) - len(failed)} factions in {UNITS_DIR}: {format_counts(totals)}")
+    if total_review:
+        print(f"NOTE: {total_review} units failed validation and need manual review.")
+    return not failed
+
+def check_fixtures(path=HEADER_FIXTURES_PATH):
+    """Parse each fixture's header lines and compare the result with its expectations.
+
+    Returns:
+        True if every fixture passed
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)
+
+    failures = 0
+    for fixture in fixtures:
+        name, subtitle, characteristics = parse_header(fixture['lines'])
+        actual = {'name': name, 'subtitle': subtitle, 'characteristics': characteristics}
+        problems = [f"{key}: expected {value!r}, got {actual[key]!r}"
+                    for key, value in fixture['expect'].items() if actual[key] != value]
+        if problems:
+            failures += 1
+            print(f"✗ {fixture['case']} ({fixture['source']})")
+            for problem in problems:
+                print(f"    {problem}")
+        else:
+            print(f"✓ {fixture['case']}")
+    print(f"\n{len(fixtures) - failures}/{len(fixtures)} fixtures passed")
+    return failures == 0
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract unit warscrolls from faction pack text files.",
+        epilog="Example: python extract_units_from_text.py flesh-eater-courts")
+    parser.add_argument('faction_id', nargs='?', help="Faction id, e.g. flesh-eater-courts")
+    parser.add_argument('--all', action='store_true',
+                        help="Extract every faction found in docs/references/factions")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Worker processes for --all (0 = one per CPU core)")
+    parser.add_argument('--unit',
+                        help="Only re-extract this unit (id or name), using the cached "
+                             "warscroll index to seek straight to it")
+    parser.add_argument('--merge', action='store_true',
+                        help="Update existing unit files in place, keeping hand-curated "
+                             "fields and recording field provenance in '_provenance'")
+    parser.add_argument('--check-fixtures', action='store_true',
+                        help=f"Check the header parser against {HEADER_FIXTURES_PATH.name} and exit")
+    args = parser.parse_args()
+
+    if args.check_fixtures:
+        sys.exit(0 if check_fixtures() else 1)
+
+    if bool(args.faction_id) == args.all:
+        parser.error("give either a faction id or --all")
+    if args.unit and args.all:
+        parser.error("--unit needs a faction id, not --all")
+
+    faction_files = discover_faction_files()
+
+    if args.all:
+        workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        success = extract_all(faction_files, min(workers, len(faction_files)) or 1, args.merge)
+        sys.exit(0 if success else 1)
+
+    text_files = faction_files.get(args.faction_id)
+    if not text_files:
+        print(f"No text file found for faction: {args.faction_id}")
+        sys.exit(1)
+
+    if args.unit:
+        sys.exit(0 if extract_unit(args.faction_id, text_files, args.unit, args.merge) else 1)
 
-    print(f"\n✓ Created {len(units)} unit stub files in {output_dir}")
-    print(f"\nNOTE: These are stubs that need manual completion.")
-    print("Each file is marked with '_needs_manual_review': true")
+    extract_faction(args.faction_id, text_files, args.merge)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Build and query an inverted full-text index over the rules reference texts.
+
+Every .txt file in docs/references/rules is split into pages (the
+'--- Page N ---' markers written by extract_pdf_text.py, or form feeds for
+plain pdftotext output) and tokenized. The index records, for each token, its
+positions in each file, plus the page, section ("CORE RULES") and numbered
+rule heading ("20.0 WEAPON ABILITIES") each position falls under, so phrase
+lookups return where a rule is and the text around it without scanning the
+files.
+
+The index is cached at docs/references/rules/.rules.index.json and rebuilt
+when a rules file changes (checked by mtime/size, then content hash).
+
+Usage:
+    python index_rules_text.py "strike-first"
+    python index_rules_text.py "ward roll" --context 2 --limit 5
+    python index_rules_text.py --rebuild
+"""
+
+import argparse
+import bisect
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+RULES_DIR = ROOT_DIR / 'docs' / 'references' / 'rules'
+INDEX_PATH = RULES_DIR / '.rules.index.json'
+# Bump the version when tokenizing or page/section detection changes
+INDEX_VERSION = 1
+
+PAGE_MARKER_PATTERN = re.compile(r'^--- Page (\d+) ---$')
+# Lines repeated at the top of every page before its section title
+PAGE_HEADER_PATTERN = re.compile(r'^(?:®|RULES UPDATES|BATTLE PROFILES|[A-Z]+ \d{4})$')
+SECTION_TITLE_PATTERN = re.compile(r"^[A-Z][A-Z0-9 ,:&'’-]+$")
+# '2.2 DICE', '19.0 STRIKE-FIRST AND STRIKE-LAST'; two-column pages can put
+# several on one line
+RULE_HEADING_PATTERN = re.compile(r"(?<![\w.])(\d+(?:\.\d+)+) ([A-Z][A-Z'’-]+(?: [A-Z][A-Z'’-]+)*)")
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+sys.path.insert(0, str(ROOT_DIR / 'packages' / 'shared' / 'scripts'))
+
+from update_unit_points import file_sha256, write_text_atomic  # noqa: E402
+
+def tokenize(text):
+    """Lowercase word tokens; 'Strike-first' -> ['strike', 'first']."""
+    return TOKEN_PATTERN.findall(text.lower().replace('’', "'"))
+
+def iter_pages(text):
+    """Yield (page number, lines) for a rules text file."""
+    if PAGE_MARKER_PATTERN.search(text.split('\n', 1)[0]) or '\n--- Page ' in text:
+        page, lines = None, []
+        for line in text.split('\n'):
+            marker = PAGE_MARKER_PATTERN.match(line.strip())
+            if marker:
+                if page is not None:
+                    yield page, lines
+                page, lines = int(marker.group(1)), []
+            elif page is not None:
+                lines.append(line)
+        if page is not None:
+            yield page, lines
+        return
+
+    # pdftotext without --layout markers separates pages with form feeds
+    for number, page_text in enumerate(text.split('\f'), start=1):
+        if page_text.strip():
+            yield number, page_text.split('\n')
+
+def page_section(lines):
+    """Return the section title under a page's running header, if any."""
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or PAGE_HEADER_PATTERN.match(stripped):
+            continue
+        return stripped if SECTION_TITLE_PATTERN.match(stripped) else None
+    return None
+
+def index_file(text_file, postings):
+    """Tokenize one file into postings and return its page/line tables.
+
+    Args:
+        text_file: Path to the rules text file
+        postings: Dict of token -> {file name: [positions]}, updated in place
+
+    Returns:
+        Dict with the file's lines, lineStarts (token position where each
+        line starts) and pages (page, section, firstLine, headings)
+    """
+    with open(text_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    lines, line_starts, pages = [], [], []
+    position = 0
+    section = None
+    for page, page_lines in iter_pages(text):
+        section = page_section(page_lines) or section
+        entry = {'page': page, 'section': section, 'firstLine': len(lines), 'headings': []}
+        pages.append(entry)
+        for line in page_lines:
+            line = line.rstrip()
+            if not line.strip():
+                continue
+            for heading in RULE_HEADING_PATTERN.finditer(line):
+                offset = len(tokenize(line[:heading.start()]))
+                entry['headings'].append([position + offset, f"{heading.group(1)} {heading.group(2)}"])
+            lines.append(line)
+            line_starts.append(position)
+            for token in tokenize(line):
+                postings.setdefault(token, {}).setdefault(text_file.name, []).append(position)
+                position += 1
+
+    return {'lines': lines, 'lineStarts': line_starts, 'pages': pages, 'tokens': position}
+
+def build_rules_index(rules_dir=RULES_DIR):
+    """Index every non-empty .txt file in the rules directory.
+
+    Files with the same content as one already indexed are recorded as
+    duplicates rather than indexed twice.
+    """
+    index = {'version': INDEX_VERSION, 'files': {}, 'postings': {}}
+    by_hash = {}
+    for text_file in sorted(rules_dir.glob('*.txt')):
+        stat = text_file.stat()
+        entry = {'sha256': file_sha256(text_file), 'mtime': stat.st_mtime, 'size': stat.st_size}
+        if stat.st_size == 0:
+            entry['empty'] = True
+        elif entry['sha256'] in by_hash:
+            entry['duplicateOf'] = by_hash[entry['sha256']]
+        else:
+            by_hash[entry['sha256']] = text_file.name
+            entry.update(index_file(text_file, index['postings']))
+        index['files'][text_file.name] = entry
+    return index
+
+def index_is_current(index, rules_dir=RULES_DIR):
+    """Check a loaded index against the rules files on disk.
+
+    mtime and size are trusted when they match; otherwise the content hash
+    decides, and a touched but unchanged file only gets its stat refreshed.
+
+    Returns:
+        (current, refreshed) - refreshed is True if any stat was updated
+    """
+    text_files = {path.name: path for path in rules_dir.glob('*.txt')}
+    if set(text_files) != set(index['files']):
+        return False, False
+    refreshed = False
+    for name, path in text_files.items():
+        entry = index['files'][name]
+        stat = path.stat()
+        if entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+            continue
+        if entry['sha256'] != file_sha256(path):
+            return False, False
+        entry['mtime'], entry['size'] = stat.st_mtime, stat.st_size
+        refreshed = True
+    return True, refreshed
+
+def save_rules_index(index, index_path=INDEX_PATH):
+    """Atomically write the rules index (compact; it is a cache, not a source)."""
+    write_text_atomic(index_path, json.dumps(index, ensure_ascii=False, separators=(',', ':')))
+
+def load_rules_index(rebuild=False, rules_dir=RULES_DIR, index_path=INDEX_PATH):
+    """Load the cached rules index, rebuilding and saving it if stale."""
+    index = None
+    if not rebuild and index_path.exists():
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != INDEX_VERSION:
+            index = None
+
+    if index is not None:
+        current, refreshed = index_is_current(index, rules_dir)
+        if current:
+            # Save refreshed stats so the hash check isn't repeated next time
+            if refreshed:
+                save_rules_index(index, index_path)
+            return index
+
+    index = build_rules_index(rules_dir)
+    save_rules_index(index, index_path)
+    return index
+
+def find_phrase(index, tokens):
+    """Return {file name: [start positions]} where the tokens occur in order."""
+    if not tokens:
+        return {}
+    postings = [index['postings'].get(token) for token in tokens]
+    if not all(postings):
+        return {}
+
+    matches = {}
+    for name, starts in postings[0].items():
+        candidates = starts
+        for offset, token_postings in enumerate(postings[1:], start=1):
+            positions = set(token_postings.get(name, ()))
+            candidates = [start for start in candidates if start + offset in positions]
+            if not candidates:
+                break
+        if candidates:
+            matches[name] = candidates
+    return matches
+
+def describe_position(file_entry, position, context=1):
+    """Locate a token position: page, section, rule heading and nearby lines."""
+    line = bisect.bisect_right(file_entry['lineStarts'], position) - 1
+    pages = file_entry['pages']
+    page = pages[bisect.bisect_right([p['firstLine'] for p in pages], line) - 1]
+    heading = None
+    for heading_position, title in page['headings']:
+        if heading_position > position:
+            break
+        heading = title
+    start = max(page['firstLine'], line - context)
+    return {
+        'page': page['page'],
+        'section': page['section'],
+        'heading': heading,
+        'line': line,
+        'text': file_entry['lines'][start:line + context + 1],
+    }
+
+def search_rules(index, query, limit=20, context=1):
+    """Find a word or phrase in the rules texts.
+
+    Returns:
+        List of hits (file, page, section, heading, line, text), in file and
+        page order, at most limit long
+    """
+    hits = []
+    for name, starts in sorted(find_phrase(index, tokenize(query)).items()):
+        file_entry = index['files'][name]
+        for start in starts:
+            hits.append({'file': name, **describe_position(file_entry, start, context)})
+            if len(hits) >= limit:
+                return hits
+    return hits
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search the rules reference texts through a cached inverted index.",
+        epilog='Example: python index_rules_text.py "strike-first" --limit 5')
+    parser.add_argument('query', nargs='?', help="Word or phrase to look up")
+    parser.add_argument('--limit', type=int, default=20, help="Maximum hits to show")
+    parser.add_argument('--context', type=int, default=1, help="Lines of context around each hit")
+    parser.add_argument('--rebuild', action='store_true', help="Rebuild the index from scratch")
+    args = parser.parse_args()
+
+    if not args.query and not args.rebuild:
+        parser.error("give a query or --rebuild")
+
+    start = time.perf_counter()
+    index = load_rules_index(args.rebuild)
+    loaded = time.perf_counter()
+    indexed = [name for name, entry in index['files'].items() if 'lines' in entry]
+    print(f"✓ Index of {len(indexed)} files, {len(index['postings'])} terms "
+          f"loaded in {(loaded - start) * 1000:.0f} ms")
+    if not args.query:
+        return
+
+    hits = search_rules(index, args.query, args.limit, args.context)
+    elapsed = (time.perf_counter() - loaded) * 1000
+    duplicates = {name: entry['duplicateOf'] for name, entry in index['files'].items()
+                  if 'duplicateOf' in entry}
+    print(f"{len(hits)} hits for '{args.query}' in {elapsed:.2f} ms\n")
+    for hit in hits:
+        aliases = [name for name, original in duplicates.items() if original == hit['file']]
+        where = ' › '.join(part for part in (hit['section'], hit['heading']) if part)
+        print(f"{hit['file']}{' (= ' + ', '.join(aliases) + ')' if aliases else ''}, "
+              f"page {hit['page']}{': ' + where if where else ''}")
+        for line in hit['text']:
+            print(f"    {line}")
+        print()
+    sys.exit(0 if hits else 1)
+
+if __name__ == '__main__':
+    main()